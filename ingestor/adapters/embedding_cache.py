@@ -0,0 +1,50 @@
+"""
+Embedding cache.
+
+LRU-кэш векторов по хэшу текста: повторные запросы и переиндексация
+неизмененных чанков не ходят в модель эмбеддингов.
+"""
+
+import hashlib
+from collections import OrderedDict
+
+try:
+    import xxhash
+except ImportError:  # xxhash опционален
+    xxhash = None
+
+
+class EmbeddingCache:
+    """Ограниченный LRU-кэш: ключ — дайджест текста, а не сам текст."""
+
+    def __init__(self, maxsize: int = 10_000) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[bytes, list[float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(text: str) -> bytes:
+        # Кэш живет только в памяти: криптостойкость не нужна, xxh3_128 в разы быстрее SHA-256
+        data = text.encode("utf-8")
+        if xxhash is not None:
+            return xxhash.xxh3_128_digest(data)
+        return hashlib.sha256(data).digest()
+
+    def get(self, key: bytes) -> list[float] | None:
+        vector = self._data.get(key)
+        if vector is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return vector
+
+    def put(self, key: bytes, vector: list[float]) -> None:
+        self._data[key] = vector
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
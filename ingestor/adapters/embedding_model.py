@@ -5,9 +5,16 @@ Manages communication with the embedding model service.
 """
 
 import asyncio
-from typing import List
+from typing import List, Set, Tuple
 
 import httpx
+
+try:
+    import h2  # noqa: F401 — httpx включает HTTP/2 только при установленном h2
+    _HTTP2_AVAILABLE = True
+except ImportError:  # h2 опционален
+    _HTTP2_AVAILABLE = False
+
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception
 from infra.exceptions import (
     FatalValidationError,
@@ -16,6 +23,7 @@ from infra.logger import get_logger
 from infra.httpx_handler import map_httpx_error_to_exception
 from infra.config.endpoints.embedding import Embedding
 from ingestor.core.models.chunk import Chunk
+from ingestor.adapters.embedding_cache import EmbeddingCache
 
 log = get_logger("ingestor.embedding_model")
 
@@ -27,22 +35,43 @@ class EmbeddingModel:
 
     _shared_client: httpx.AsyncClient | None = None
     _shared_client_timeout: float = 30.0
+    # Пул соединений общий для всех экземпляров: пачки и параллельные воркеры
+    # не ждут свободного соединения и не открывают новые TCP на каждый запрос
+    _shared_client_limits = httpx.Limits(max_connections=32, max_keepalive_connections=32)
+    _shared_client_connect_timeout: float = 5.0
 
     def __init__(self, embed_url: str, api_key: str, served_model_name: str, 
-                 rate_limit_rpm: int = 100, max_chars: int = 8000, batch_size: int = 10, timeout: float = 30.0) -> None:
+                 rate_limit_rpm: int = 100, max_chars: int = 8000, batch_size: int = 10, timeout: float = 30.0,
+                 cache_size: int = 10_000, coalesce_wait_ms: float = 10.0,
+                 max_concurrent_requests: int = 0) -> None:
         self.served_model_name = served_model_name
         self.embed_url = embed_url.rstrip("/")
         self.api_key = api_key
         self._max_chars = max_chars
         self._batch_size = batch_size
         self._timeout = timeout
-        self._rate_limiter = asyncio.Semaphore(max(1, rate_limit_rpm // 60))
+        # Запросов к модели в полете; run() держит столько же пачек одновременно
+        self._max_concurrent = max(1, max_concurrent_requests or rate_limit_rpm // 60)
+        self._rate_limiter = asyncio.Semaphore(self._max_concurrent)
+        # 0 отключает кэш
+        self._cache = EmbeddingCache(cache_size) if cache_size > 0 else None
+        # Мелкие запросы от параллельных вызовов копятся до batch_size текстов или
+        # coalesce_wait и уходят одним POST; 0 отключает объединение
+        self._coalesce_wait = max(0.0, coalesce_wait_ms) / 1000
+        self._pending: List[Tuple[List[str], asyncio.Future]] = []
+        self._pending_texts = 0
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flush_tasks: Set[asyncio.Task] = set()
 
     @classmethod
     def _get_shared_client(cls) -> httpx.AsyncClient:
         """Get or create shared HTTP client (Singleton pattern)."""
         if not hasattr(cls, "_shared_client") or cls._shared_client is None:
-            cls._shared_client = httpx.AsyncClient(timeout=cls._shared_client_timeout)
+            cls._shared_client = httpx.AsyncClient(
+                http2=_HTTP2_AVAILABLE,
+                limits=cls._shared_client_limits,
+                timeout=httpx.Timeout(cls._shared_client_timeout, connect=cls._shared_client_connect_timeout),
+            )
         return cls._shared_client
 
     @classmethod
@@ -126,6 +155,12 @@ class EmbeddingModel:
             log.warning("embedding_model.truncate", original_len=len(text), new_len=self._max_chars)
             text = text[:self._max_chars]
 
+        if self._cache is not None:
+            key = self._cache.key(text)
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+
         try:
             response = await self._get_shared_client().post(
                 f"{self.embed_url}{Embedding.EMBEDDINGS}",
@@ -137,7 +172,10 @@ class EmbeddingModel:
             )
             response.raise_for_status()
             result = response.json()
-            return self._parse_embedding_response(result)["embedding"]
+            vector = self._parse_embedding_response(result)["embedding"]
+            if self._cache is not None:
+                self._cache.put(key, vector)
+            return vector
             
         except httpx.HTTPError as e:
             log.error("embedding_model.get_embedding.http_error", error=str(e), url=str(e.request.url) if e.request else None)
@@ -160,52 +198,122 @@ class EmbeddingModel:
         Compute embeddings for a list of chunks.
         Compatible with EmbedStage interface.
         """
-        # Filter chunks with valid content
-        valid_chunks = [c for c in chunks if (c.summary or c.content or "").strip()]
+        # Filter chunks with valid content; текст для эмбеддинга готовится здесь же один раз
+        prepared = []
+        for c in chunks:
+            text = c.summary or c.content
+            if text and not text.isspace():
+                prepared.append((c, text[:1000].strip() or "empty"))
         
-        if not valid_chunks:
+        if not prepared:
             log.warning("embed.skip", reason="No valid content in chunks")
             return chunks
         
-        log.info("embed.start", total=len(chunks), valid=len(valid_chunks))
+        log.info("embed.start", total=len(chunks), valid=len(prepared))
         
         # Process in batches of configured size for efficiency
         batch_size = self._batch_size
-        for i in range(0, len(valid_chunks), batch_size):
-            batch = valid_chunks[i:i + batch_size]
+        starts = range(0, len(prepared), batch_size)
+        sem = asyncio.Semaphore(self._max_concurrent)
+
+        async def embed_batch(i: int) -> None:
+            batch = prepared[i:i + batch_size]
             try:
-                # Prepare texts for the batch
-                texts = []
-                for c in batch:
-                    text = (c.summary or c.content or "")[:1000].strip()
-                    texts.append(text if text else "empty")
-                
-                # Get embeddings for the entire batch at once
-                batch_embeddings = await self.get_embeddings(texts)
+                async with sem:
+                    # Get embeddings for the entire batch at once
+                    batch_embeddings = await self.get_embeddings([text for _, text in batch])
                 
                 # Assign embeddings to chunks
-                for j, chunk in enumerate(batch):
-                    chunk.embedding = batch_embeddings[j]
+                for (chunk, _), embedding in zip(batch, batch_embeddings):
+                    chunk.embedding = embedding
                     
             except Exception as e:
                 log.error(f"embed.batch.failed", batch_start=i, error=str(e), exc_info=True)
-                continue
+
+        if self._max_concurrent == 1 or len(starts) == 1:
+            # Один слот у rate limiter — пачки все равно идут по очереди, задачи не нужны
+            for i in starts:
+                await embed_batch(i)
+        else:
+            # Пачки независимы — до _max_concurrent HTTP-запросов в полете
+            await asyncio.gather(*(embed_batch(i) for i in starts))
         
         log.info("embed.complete", chunks_count=len(chunks))
         return chunks
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=30),
-        retry=retry_if_exception(lambda e: isinstance(e, (httpx.HTTPError, TimeoutError)))
-    )
     async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
         """
         Get embeddings for multiple texts in a single request.
+        Cached texts are served locally, only misses go to the model.
         """
         if not texts:
             raise ValueError("Empty input list")
-        
+
+        # Та же защита от переполнения контекста, что и в get_embedding
+        texts = [t[:self._max_chars] if len(t) > self._max_chars else t for t in texts]
+
+        if self._cache is None:
+            return await self._fetch_embeddings(texts)
+
+        keys = [self._cache.key(t) for t in texts]
+        embeddings: List[List[float] | None] = [self._cache.get(k) for k in keys]
+        missing = [i for i, emb in enumerate(embeddings) if emb is None]
+        if missing:
+            fetched = await self._fetch_embeddings([texts[i] for i in missing])
+            for i, vector in zip(missing, fetched):
+                embeddings[i] = vector
+                self._cache.put(keys[i], vector)
+        return embeddings
+
+    async def _fetch_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Запрос к модели; мелкие пачки объединяются с запросами других вызовов."""
+        if self._coalesce_wait <= 0 or len(texts) >= self._batch_size:
+            return await self._request_embeddings(texts)
+
+        if self._pending_texts + len(texts) > self._batch_size:
+            self._flush_pending()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((texts, future))
+        self._pending_texts += len(texts)
+        if self._pending_texts >= self._batch_size:
+            self._flush_pending()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._coalesce_wait, self._flush_pending)
+        return await future
+
+    def _flush_pending(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending, self._pending_texts = self._pending, [], 0
+        if pending:
+            task = asyncio.get_running_loop().create_task(self._send_pending(pending))
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+
+    async def _send_pending(self, pending: List[Tuple[List[str], asyncio.Future]]) -> None:
+        """Один POST на все накопленные тексты, результаты раздаются по срезам."""
+        texts = [text for part, _ in pending for text in part]
+        try:
+            embeddings = await self._request_embeddings(texts)
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        offset = 0
+        for part, future in pending:
+            if not future.done():
+                future.set_result(embeddings[offset:offset + len(part)])
+            offset += len(part)
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=30),
+        retry=retry_if_exception(lambda e: isinstance(e, (httpx.HTTPError, TimeoutError)))
+    )
+    async def _request_embeddings(self, texts: List[str]) -> List[List[float]]:
         try:
             async with self._rate_limiter:
                 response = await self._get_shared_client().post(
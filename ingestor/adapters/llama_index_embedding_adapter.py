@@ -104,6 +104,10 @@ class EmbeddingModelAdapter(BaseEmbedding):
     async def _aget_query_embedding(self, query: str) -> List[float]:
         return await self.aget_query_embedding(query)
     
+    async def _aget_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        # aget_text_embedding_batch режет вход по embed_batch_size: один HTTP-запрос на пачку
+        return await self.aget_text_embeddings(texts)
+    
     def _get_text_embedding(self, text: str) -> List[float]:
         raise NotImplementedError("Async-only adapter")
     
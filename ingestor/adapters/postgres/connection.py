@@ -57,10 +57,7 @@ class PostgresConnection:
 
         log.info("postgres.init.start")
 
-        conn_string = (
-            f"postgresql://{storage_config.POSTGRES_USER}:{storage_config.POSTGRES_PASSWORD}"
-            f"@{storage_config.POSTGRES_HOST}:{storage_config.POSTGRES_PORT}/{storage_config.POSTGRES_DB}"
-        )
+        conn_string = self._conn_string()
 
         try:
             # Create a connection init function that registers vector type
@@ -93,6 +90,13 @@ class PostgresConnection:
                 self._pool = None
             raise
 
+    @staticmethod
+    def _conn_string() -> str:
+        return (
+            f"postgresql://{storage_config.POSTGRES_USER}:{storage_config.POSTGRES_PASSWORD}"
+            f"@{storage_config.POSTGRES_HOST}:{storage_config.POSTGRES_PORT}/{storage_config.POSTGRES_DB}"
+        )
+
     async def _setup_extensions(self, conn: asyncpg.Connection) -> None:
         """Register extensions like pgvector."""
         # Note: register_vector is now called in the init_connection function
@@ -175,6 +179,22 @@ class PostgresConnection:
 
         return await _execute_with_retry()
 
+    async def execute_maintenance(self, query: str) -> None:
+        """
+        Long-running DDL (CREATE INDEX CONCURRENTLY etc.) on a dedicated connection.
+
+        No statement timeout and no retries: an index build that runs for minutes
+        must not be cancelled and started over. CONCURRENTLY cannot run inside
+        a transaction, so the pool and its wrappers are not used.
+        """
+        log.debug("postgres.maintenance.start", query=query[:50])
+        conn = await asyncpg.connect(self._conn_string(), timeout=self._pool_timeout)
+        try:
+            await conn.execute("SET statement_timeout = 0")
+            await conn.execute(query)
+        finally:
+            await conn.close()
+
     async def close(self) -> None:
         if self._pool:
             await self._pool.close()
@@ -36,6 +36,24 @@ def map_file_summary(row) -> FileSummary:
     )
 
 
+# size и mtime_ns хранятся только в JSONB metadata
+_METADATA_COLUMNS = (
+    "file_path, mtime, checksum, COALESCE((metadata->>'size')::bigint, 0) AS size, "
+    "COALESCE((metadata->>'mtime_ns')::bigint, 0) AS mtime_ns"
+)
+
+
+def _map_metadata(row) -> Dict:
+    """Map a metadata row to the dict returned by get_files_metadata."""
+    return {
+        "file_path": row["file_path"],
+        "mtime": row.get("mtime", 0),
+        "checksum": row.get("checksum", ""),
+        "size": row.get("size", 0),
+        "mtime_ns": row.get("mtime_ns", 0),
+    }
+
+
 class FileSummaryRepository:
     def __init__(self, connection: PostgresConnection):
         self._conn = connection
@@ -91,6 +109,27 @@ class FileSummaryRepository:
         
         return results
 
+    async def get_by_prefix(self, prefix: str) -> List[FileSummary]:
+        # Фильтр на стороне БД: не тянем всю таблицу ради одного модуля
+        rows = await self._conn.execute_query(
+            """
+            SELECT file_path, summary, metadata, mtime, checksum FROM file_summaries
+            WHERE starts_with(file_path, $1) AND summary <> ''
+            """,
+            prefix,
+            fetch='all'
+        )
+
+        results = []
+        for row in rows:
+            try:
+                results.append(map_file_summary(row))
+            except Exception as e:
+                log.warning("postgres.map_file_summary.failed", file=row.get("file_path"), error=str(e))
+                continue
+
+        return results
+
     async def delete_by_files(self, file_paths: List[str]) -> None:
         await self._conn.execute_query(
             "DELETE FROM file_summaries WHERE file_path = ANY($1)",
@@ -105,18 +144,18 @@ class FileSummaryRepository:
         )
         log.info("postgres.delete_file_summary", path=file_path)
 
-    async def update_metadata(self, file_path: str, mtime: float, checksum: str) -> None:
+    async def update_metadata(self, file_path: str, mtime: float, checksum: str, size: int = 0) -> None:
         meta = {
             "mtime": mtime,
             "checksum": checksum,
-            "size": 0 
+            "size": size,
         }
         await self._conn.execute_query(
              """
             INSERT INTO file_summaries (file_path, summary, metadata, mtime, checksum)
             VALUES ($1, '', $2, $3, $4)
             ON CONFLICT (file_path) DO UPDATE SET
-                metadata = file_summaries.metadata || $2,
+                metadata = (file_summaries.metadata - 'mtime_ns') || $2,
                 mtime = EXCLUDED.mtime,
                 checksum = EXCLUDED.checksum
             """,
@@ -128,39 +167,26 @@ class FileSummaryRepository:
 
     async def get_metadata(self, file_path: str) -> Optional[Dict]:
         row = await self._conn.execute_query(
-            "SELECT * FROM file_summaries WHERE file_path = $1",
+            f"SELECT {_METADATA_COLUMNS} FROM file_summaries WHERE file_path = $1",
             file_path,
             fetch='row'
         )
         if not row:
             return None
         
-        return {
-            "file_path": row["file_path"],
-            "mtime": row.get("mtime", 0),
-            "checksum": row.get("checksum", ""),
-            "size": 0,
-        }
+        return _map_metadata(row)
 
     async def get_batch_metadata(self, file_paths: List[str]) -> Dict[str, Dict]:
         if not file_paths:
             return {}
         
         rows = await self._conn.execute_query(
-            "SELECT file_path, mtime, checksum FROM file_summaries WHERE file_path = ANY($1)",
+            f"SELECT {_METADATA_COLUMNS} FROM file_summaries WHERE file_path = ANY($1)",
             file_paths,
             fetch='all'
         )
         
-        return {
-            row["file_path"]: {
-                "file_path": row["file_path"],
-                "mtime": row.get("mtime", 0),
-                "checksum": row.get("checksum", ""),
-                "size": 0,
-            }
-            for row in rows
-        }
+        return {row["file_path"]: _map_metadata(row) for row in rows}
 
 
 class ModuleSummaryRepository:
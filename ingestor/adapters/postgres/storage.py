@@ -5,6 +5,7 @@ Uses PGVectorStore for chunks (vector storage) and repositories for summaries.
 No separate chunks table - all chunks are in the vector store table.
 """
 
+import asyncio
 from typing import List, Optional, Dict
 
 from ingestor.core.ports.storage import BaseStorage
@@ -16,6 +17,7 @@ from ingestor.adapters.postgres.connection import PostgresConnection
 from ingestor.adapters.postgres.repositories.summary import FileSummaryRepository, ModuleSummaryRepository
 from ingestor.adapters.postgres.repositories.stats import StatsRepository
 from ingestor.config import storage_config
+from infra.logger import get_logger
 
 # Import PGVectorStore - will be available in container where llama-index-vector-stores-postgres is installed
 try:
@@ -33,6 +35,8 @@ except ImportError as e:
     print(f"Install with: pip install llama-index-vector-stores-postgres>=0.7.3", file=sys.stderr)
     raise ImportError(f"PGVectorStore import failed: {e}") from e
 
+log = get_logger("ingestor.storage.postgres")
+
 
 class PostgreSQLStorage(BaseStorage):
     """
@@ -47,26 +51,113 @@ class PostgreSQLStorage(BaseStorage):
         self._file_summaries = FileSummaryRepository(self._conn)
         self._module_summaries = ModuleSummaryRepository(self._conn)
         self._stats = StatsRepository(self._conn)
+        self._index_task: Optional[asyncio.Task] = None
         
-        # Initialize vector store if pgvector enabled
-        if storage_config.USE_PGVECTOR:
-            sync_conn_str = f"postgresql://{storage_config.POSTGRES_USER}:{storage_config.POSTGRES_PASSWORD}@{storage_config.POSTGRES_HOST}:{storage_config.POSTGRES_PORT}/{storage_config.POSTGRES_DB}"
-            async_conn_str = f"postgresql+asyncpg://{storage_config.POSTGRES_USER}:{storage_config.POSTGRES_PASSWORD}@{storage_config.POSTGRES_HOST}:{storage_config.POSTGRES_PORT}/{storage_config.POSTGRES_DB}"
-            self._vector_store = PGVectorStore(
-                connection_string=sync_conn_str,
-                async_connection_string=async_conn_str,
-                table_name=storage_config.VECTOR_STORE_TABLE_NAME,
-                embed_dim=storage_config.PGVECTOR_DIMENSIONS,
-                indexed_metadata_keys={("file_path", "text")} if storage_config.USE_PGVECTOR else None,
-            )
-        else:
-            self._vector_store = None
+        # Тип столбца может не совпасть с флагом; initialize() сверяет его с таблицей
+        self._use_halfvec = storage_config.PGVECTOR_USE_HALFVEC
+        self._vector_store = self._build_vector_store() if storage_config.USE_PGVECTOR else None
+
+    def _build_vector_store(self) -> PGVectorStore:
+        sync_conn_str = f"postgresql://{storage_config.POSTGRES_USER}:{storage_config.POSTGRES_PASSWORD}@{storage_config.POSTGRES_HOST}:{storage_config.POSTGRES_PORT}/{storage_config.POSTGRES_DB}"
+        async_conn_str = f"postgresql+asyncpg://{storage_config.POSTGRES_USER}:{storage_config.POSTGRES_PASSWORD}@{storage_config.POSTGRES_HOST}:{storage_config.POSTGRES_PORT}/{storage_config.POSTGRES_DB}"
+        return PGVectorStore(
+            connection_string=sync_conn_str,
+            async_connection_string=async_conn_str,
+            table_name=storage_config.VECTOR_STORE_TABLE_NAME,
+            embed_dim=storage_config.PGVECTOR_DIMENSIONS,
+            use_halfvec=self._use_halfvec,
+            hnsw_kwargs=self._hnsw_kwargs(),
+            indexed_metadata_keys={("file_path", "text")},
+        )
+
+    def _hnsw_ops(self) -> str:
+        return "halfvec_cosine_ops" if self._use_halfvec else "vector_cosine_ops"
+
+    def _hnsw_kwargs(self) -> Optional[Dict]:
+        if not storage_config.PGVECTOR_HNSW:
+            return None
+        return {
+            "hnsw_m": storage_config.PGVECTOR_HNSW_M,
+            "hnsw_ef_construction": storage_config.PGVECTOR_HNSW_EF_CONSTRUCTION,
+            "hnsw_ef_search": storage_config.PGVECTOR_HNSW_EF_SEARCH,
+            "hnsw_dist_method": self._hnsw_ops(),
+        }
 
     async def initialize(self) -> None:
         """Explicitly initialize the storage."""
         await self._conn.initialize()
+        if self._vector_store is not None:
+            await self._match_embedding_column()
+        if self._vector_store is not None and storage_config.PGVECTOR_HNSW and self._index_task is None:
+            # Сборка индекса на большой таблице идет минутами; CONCURRENTLY не блокирует запись,
+            # поэтому запуск сервиса ее не ждет
+            self._index_task = asyncio.create_task(self._ensure_vector_index(), name="pgvector_hnsw_index")
+
+    async def _match_embedding_column(self) -> None:
+        """
+        PGVECTOR_USE_HALFVEC не мигрирует существующую таблицу: при расхождении с типом
+        столбца каждый поиск падал бы на приведении типов. Работаем с тем типом, что в таблице.
+        """
+        table = f"data_{storage_config.VECTOR_STORE_TABLE_NAME}"
+        column_type = await self._conn.execute_query(
+            "SELECT format_type(a.atttypid, a.atttypmod) FROM pg_attribute a "
+            "WHERE a.attrelid = to_regclass($1) AND a.attname = 'embedding' AND NOT a.attisdropped",
+            f"public.{table}",
+            fetch="val",
+        )
+        if column_type is None:
+            return  # таблицы еще нет, PGVectorStore создаст ее по флагу
+        column_halfvec = column_type.startswith("halfvec")
+        if column_halfvec == self._use_halfvec:
+            return
+        log.warning(
+            "postgres.vector_column.type_mismatch",
+            table=table,
+            column_type=column_type,
+            use_halfvec=self._use_halfvec,
+            hint="migrate the embedding column to change PGVECTOR_USE_HALFVEC",
+        )
+        self._use_halfvec = column_halfvec
+        self._vector_store = self._build_vector_store()
+
+    async def _ensure_vector_index(self) -> None:
+        """
+        PGVectorStore строит HNSW только вместе с новой таблицей.
+        Для уже существующей таблицы без ANN-индекса создаем его здесь.
+        """
+        table = f"data_{storage_config.VECTOR_STORE_TABLE_NAME}"
+        index = f"{table}_embedding_hnsw_idx"
+        try:
+            exists = await self._conn.execute_query(
+                "SELECT to_regclass($1) IS NOT NULL", f"public.{table}", fetch="val"
+            )
+            if not exists:
+                return
+            # Невалидный индекс остается после прерванного CREATE INDEX CONCURRENTLY
+            has_hnsw = await self._conn.execute_query(
+                "SELECT EXISTS (SELECT 1 FROM pg_indexes i JOIN pg_index x ON x.indexrelid = to_regclass(i.indexname) "
+                "WHERE i.tablename = $1 AND i.indexdef ILIKE '%USING hnsw%' AND x.indisvalid)",
+                table,
+                fetch="val",
+            )
+            if has_hnsw:
+                return
+            log.info("postgres.vector_index.create", table=table, ops=self._hnsw_ops())
+            await self._conn.execute_maintenance(f"DROP INDEX CONCURRENTLY IF EXISTS {index}")
+            await self._conn.execute_maintenance(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index} ON {table} "
+                f"USING hnsw (embedding {self._hnsw_ops()}) "
+                f"WITH (m = {storage_config.PGVECTOR_HNSW_M}, ef_construction = {storage_config.PGVECTOR_HNSW_EF_CONSTRUCTION})"
+            )
+            log.info("postgres.vector_index.created", table=table)
+        except Exception as e:
+            # Поиск работает и без индекса, только медленнее
+            log.warning("postgres.vector_index.create.failed", table=table, error=str(e))
 
     async def close(self) -> None:
+        if self._index_task is not None and not self._index_task.done():
+            self._index_task.cancel()
+            await asyncio.gather(self._index_task, return_exceptions=True)
         await self._conn.close()
 
     async def __aenter__(self):
@@ -155,10 +246,11 @@ class PostgreSQLStorage(BaseStorage):
         
         # Query vector store
         result = await self._vector_store.aquery(query)
+        similarities = result.similarities or []
         
         # Convert TextNode to Chunk for backwards compatibility
         chunks = []
-        for node in result.nodes:
+        for i, node in enumerate(result.nodes):
             chunk = Chunk(
                 id=node.node_id,
                 file_path=node.metadata.get("file_path", ""),
@@ -170,6 +262,7 @@ class PostgreSQLStorage(BaseStorage):
                 purpose=node.metadata.get("purpose"),
                 embedding=node.embedding,
                 metadata=node.metadata,
+                score=similarities[i] if i < len(similarities) else None,
             )
             chunks.append(chunk)
         
@@ -204,6 +297,9 @@ class PostgreSQLStorage(BaseStorage):
     async def get_all_file_summaries(self) -> List[FileSummary]:
         return await self._file_summaries.get_all()
 
+    async def get_file_summaries_by_prefix(self, prefix: str) -> List[FileSummary]:
+        return await self._file_summaries.get_by_prefix(prefix)
+
     # === Module Summaries ===
 
     async def save_module_summary(self, summary: ModuleSummary) -> None:
@@ -229,8 +325,8 @@ class PostgreSQLStorage(BaseStorage):
     async def delete_file_summary(self, file_path: str) -> None:
         await self._file_summaries.delete(file_path)
 
-    async def update_file_metadata(self, file_path: str, mtime: float, checksum: str) -> None:
-        await self._file_summaries.update_metadata(file_path, mtime, checksum)
+    async def update_file_metadata(self, file_path: str, mtime: float, checksum: str, size: int = 0) -> None:
+        await self._file_summaries.update_metadata(file_path, mtime, checksum, size)
 
      # === Stats ===
 
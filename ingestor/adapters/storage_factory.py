@@ -36,7 +36,7 @@ class StorageFactory:
             case "pg" | "postgres" | "postgresql":
                 return PostgreSQLStorage()
             case None | "mem" | "memory" | "in-memory":
-                return MemoryStorage()
+                return MemoryStorage(quantize_vectors=storage_config.MEMORY_QUANTIZE_VECTORS)
             case _:
                 # Показываем исходное значение для отладки
                 raise ValueError(
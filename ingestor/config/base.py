@@ -23,6 +23,9 @@ class EmbeddingConfig(BaseServiceConfig):
     rate_limit_rpm: int = Field(default=100, description="Rate limit in requests per minute")
     max_chars: int = Field(default=8000, description="Maximum characters to embed")
     timeout: float = Field(default=30.0, description="Request timeout for embedding in seconds")
+    cache_size: int = Field(default=10_000, description="Embedding LRU cache size (0 disables)")
+    coalesce_wait_ms: float = Field(default=10.0, description="Wait for concurrent embedding requests to merge (0 disables)")
+    max_concurrent_requests: int = Field(default=0, description="Embedding requests in flight (0 derives it from rate_limit_rpm)")
 
 
 class StorageConfig(BaseModel):
@@ -83,6 +86,10 @@ class PipelineConfig(BaseModel):
     # Summary generation
     file_summary_max_chunks: int = Field(default=20, description="Max chunks to aggregate for file summary")
 
+    # Change detection
+    checksum_algo: str = Field(default="xxh3", description="File checksum algorithm: xxh3, blake3 or md5")
+    checksum_io_depth: int = Field(default=0, description="Concurrent file reads while hashing, 0 = shared pipeline executor")
+
     # Search defaults
     search_default_top_k: int = Field(default=10, description="Default top_k for search queries")
 
@@ -116,6 +123,9 @@ class PipelineConfig(BaseModel):
                 batch_size=emb_config.EMB_BATCH_SIZE,
                 timeout=getattr(emb_config, 'EMB_TIMEOUT', 30.0),
                 max_workers=getattr(emb_config, 'EMB_MAX_WORKERS', 2),
+                cache_size=getattr(emb_config, 'EMB_CACHE_SIZE', 10_000),
+                coalesce_wait_ms=getattr(emb_config, 'EMB_COALESCE_WAIT_MS', 10.0),
+                max_concurrent_requests=getattr(emb_config, 'EMB_MAX_CONCURRENT_REQUESTS', 0),
             ),
             storage=StorageConfig(
                 type=storage_config.STORAGE_TYPE,
@@ -153,6 +163,8 @@ class PipelineConfig(BaseModel):
             config_chunk_size=getattr(runtime_config, 'CONFIG_CHUNK_SIZE', 512),
             config_chunk_overlap=getattr(runtime_config, 'CONFIG_CHUNK_OVERLAP', 50),
             file_summary_max_chunks=getattr(runtime_config, 'FILE_SUMMARY_MAX_CHUNKS', 20),
+            checksum_algo=getattr(runtime_config, 'CHECKSUM_ALGO', 'xxh3'),
+            checksum_io_depth=getattr(runtime_config, 'CHECKSUM_IO_DEPTH', 0),
             search_default_top_k=getattr(runtime_config, 'SEARCH_DEFAULT_TOP_K', 10),
             workspace_path=runtime_config.WORKSPACE_PATH,
             monitor_interval=getattr(runtime_config, 'MONITOR_INTERVAL', 10.0),
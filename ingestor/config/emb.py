@@ -1,13 +1,19 @@
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 
 
 class EMBConfig(BaseSettings):
+    model_config = SettingsConfigDict(frozen=True)
+
     EMB_URL: str | None = Field(default=None)
     EMB_API_KEY: str = Field(default="sk-dummy", alias="OPENAI_API_KEY")
     EMB_SERVED_MODEL_NAME: str = Field(default="embed-model")
     EMB_MAX_CHARS: int = Field(default=8000)
     EMB_BATCH_SIZE: int = Field(default=10)
     EMB_RATE_LIMIT_RPM: int = Field(default=100)
+    EMB_CACHE_SIZE: int = Field(default=10_000)  # векторов в LRU-кэше, 0 — выключен
+    EMB_COALESCE_WAIT_MS: float = Field(default=10.0)  # ожидание попутных запросов, 0 — выключено
+    EMB_MAX_CONCURRENT_REQUESTS: int = Field(default=0)  # запросов к модели в полете, 0 — из EMB_RATE_LIMIT_RPM
+
 
 emb_config = EMBConfig()
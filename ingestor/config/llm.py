@@ -1,10 +1,13 @@
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 
 
 class LLMConfig(BaseSettings):
+    model_config = SettingsConfigDict(frozen=True)
+
     LLM_URL: str | None = Field(default=None)
     LLM_API_KEY: str = Field(default="sk-dummy", alias="OPENAI_API_KEY")
     LLM_SERVED_MODEL_NAME: str = Field(default="default-model")
 
+
 llm_config = LLMConfig()
@@ -1,8 +1,11 @@
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 
 
 class LLMLockConfig(BaseSettings):
+    model_config = SettingsConfigDict(frozen=True)
+
     AGENT_SYSTEM_URL: str | None = Field(default=None)
 
+
 llm_lock = LLMLockConfig()
@@ -1,8 +1,10 @@
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 
 
 class RuntimeConfig(BaseSettings):
+    model_config = SettingsConfigDict(frozen=True)
+
     ENV: str = Field(default="dev")
     LOG_LEVEL: str = Field(default="INFO")
     WORKSPACE_PATH: str = Field(default="/workspace")
@@ -35,6 +37,10 @@ class RuntimeConfig(BaseSettings):
     # Summary generation
     FILE_SUMMARY_MAX_CHUNKS: int = Field(default=20)
 
+    # Change detection
+    CHECKSUM_ALGO: str = Field(default="xxh3")
+    CHECKSUM_IO_DEPTH: int = Field(default=0)  # 0 — общий пул пайплайна (min(32, CPU + 4))
+
     # Search defaults
     SEARCH_DEFAULT_TOP_K: int = Field(default=10)
 
@@ -1,9 +1,13 @@
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 
 
 class StorageConfig(BaseSettings):
+    model_config = SettingsConfigDict(frozen=True)
+
     STORAGE_TYPE: str = Field(default="memory")
+    # In-memory хранилище: держать матрицу поиска в int8 (в 4 раза меньше памяти)
+    MEMORY_QUANTIZE_VECTORS: bool = Field(default=False)
 
     # PostgreSQL connection
     POSTGRES_HOST: str = Field(default="postgres")
@@ -23,6 +27,13 @@ class StorageConfig(BaseSettings):
     # Vector storage
     USE_PGVECTOR: bool = Field(default=True)
     PGVECTOR_DIMENSIONS: int = Field(default=768)  # Changed from 1536 to match embedding model (gte-modernbert-base)
+    # halfvec (fp16) вдвое уменьшает таблицу и индекс; для существующей таблицы нужна миграция столбца
+    PGVECTOR_USE_HALFVEC: bool = Field(default=False)
+    # HNSW-индекс для ANN-поиска: без него pgvector сканирует всю таблицу на каждый запрос
+    PGVECTOR_HNSW: bool = Field(default=True)
+    PGVECTOR_HNSW_M: int = Field(default=16)
+    PGVECTOR_HNSW_EF_CONSTRUCTION: int = Field(default=64)
+    PGVECTOR_HNSW_EF_SEARCH: int = Field(default=40)
     VECTOR_STORE_TABLE_NAME: str = Field(default="chunks_vectors")  # Base name; PGVectorStore adds 'data_' prefix
 
     def to_dict(self) -> dict:
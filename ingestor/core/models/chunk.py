@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, Optional, Sequence
 
-@dataclass
+@dataclass(slots=True)
 class Chunk:
     """Базовый чанк кода/документации."""
     id: str
@@ -15,8 +15,11 @@ class Chunk:
     summary: Optional[str] = None
     purpose: Optional[str] = None
     
-    # Embeddings
-    embedding: Optional[List[float]] = None
+    # Embeddings (list из модели или компактный array("f") в хранилище)
+    embedding: Optional[Sequence[float]] = None
     
     # Metadata
     metadata: Dict = field(default_factory=dict)
+
+    # Similarity score, filled only in vector search results
+    score: Optional[float] = None
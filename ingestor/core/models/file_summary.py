@@ -2,7 +2,7 @@ from dataclasses import dataclass, field
 from typing import Dict, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class FileSummary:
     """File-level summary generated from chunk summaries using LLM."""
     file_path: str
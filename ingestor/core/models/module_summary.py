@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
 from typing import Dict, List
 
-@dataclass
+@dataclass(slots=True)
 class ModuleSummary:
     """Суммаризация на уровне модуля/пакета."""
     module_path: str
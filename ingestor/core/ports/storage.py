@@ -68,6 +68,11 @@ class BaseStorage(ABC):
         """Get all file summaries."""
         pass
 
+    @abstractmethod
+    async def get_file_summaries_by_prefix(self, prefix: str) -> List[FileSummary]:
+        """Get non-empty file summaries whose path starts with prefix."""
+        pass
+
     # === Module Summaries ===
 
     @abstractmethod
@@ -108,8 +113,8 @@ class BaseStorage(ABC):
         pass
 
     @abstractmethod
-    async def update_file_metadata(self, file_path: str, mtime: float, checksum: str) -> None:
-        """Update file metadata in database."""
+    async def update_file_metadata(self, file_path: str, mtime: float, checksum: str, size: int = 0) -> None:
+        """Update file metadata (mtime, checksum, size) in database."""
         pass
 
     # === Stats ===
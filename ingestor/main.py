@@ -21,6 +21,7 @@ from ingestor.api.server import IngestorAPI
 from ingestor.config import runtime_config, storage_config
 from ingestor.config.base import PipelineConfig
 from ingestor.pipeline.models.pipeline_context import PipelineContext
+from ingestor.pipeline.utils.executor import get_shared_executor, shared_executor_size
 from ingestor.pipeline.utils.text_splitter_helper import TextSplitterHelper
 from ingestor.services.indexer import IndexerOrchestrator
 from ingestor.services.knowledge import KnowledgePort
@@ -76,8 +77,14 @@ async def main() -> None:
         workspace=workspace,
         port=api_port,
         storage_type=storage_config.STORAGE_TYPE,
+        # uvloop или стандартный цикл — чтобы замеры пропускной способности были сопоставимы
+        event_loop=type(asyncio.get_running_loop()).__module__,
     )
 
+    # to_thread/run_in_executor(None) всех стадий идут в общий пул
+    asyncio.get_running_loop().set_default_executor(get_shared_executor())
+    log.info("ingestor.executor.configured", max_workers=shared_executor_size())
+
     # === Load central config ===
     config = PipelineConfig.from_env()
     log.info("pipeline.config.loaded", workers=config.enrich_workers)
@@ -106,10 +113,13 @@ async def main() -> None:
         rate_limit_rpm=config.embedding.rate_limit_rpm,
         max_chars=config.embedding.max_chars,
         batch_size=config.embedding.batch_size,
+        cache_size=config.embedding.cache_size,
+        coalesce_wait_ms=config.embedding.coalesce_wait_ms,
+        max_concurrent_requests=config.embedding.max_concurrent_requests,
     )
 
     # Wrap with adapter to provide BaseEmbedding interface for llama_index
-    embed_model = EmbeddingModelAdapter(embed_model_raw)
+    embed_model = EmbeddingModelAdapter(embed_model_raw, embed_batch_size=config.embedding.batch_size)
 
     # === Validate dimensions (must match exactly) ===
     log.info("dimension_validator.validation.started")
@@ -244,4 +254,10 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    try:
+        # uvloop (только Linux/macOS) ускоряет очереди и планировщик конвейера
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
\ No newline at end of file
@@ -60,5 +60,7 @@ class BasePipeline:
 
         for proc in self._processors:
             await proc.stop()
+        # Остановленные стадии не переиспользуются: start() строит их заново
+        self._processors.clear()
 
         self.log.info(f"{self.__class__.__name__} stopped")
@@ -1,5 +1,5 @@
 import asyncio
-from typing import Optional, Any
+from typing import Any, List, Optional
 
 from ingestor.pipeline.base.queues import ThrottledQueue
 from ingestor.pipeline.base.base_stage import BaseStage
@@ -8,9 +8,18 @@ from ingestor.pipeline.base.base_stage import BaseStage
 class ProcessorStage(BaseStage):
     """Обработчик: один элемент → один результат, структура сохраняется"""
 
+    # Сколько уже лежащих в очереди элементов воркер забирает за одно пробуждение;
+    # стадии с дешевой пакетной обработкой переопределяют вместе с process_many
+    DRAIN_BATCH_SIZE = 1
+    # get()/put() при непустой очереди не отдают управление: стадия без реального
+    # ожидания в process() уступает циклу событий раз в столько элементов
+    YIELD_EVERY = 64
+
     def __init__(self, name: str, max_workers: int = 1):
         super().__init__(name)
         self.max_workers = max(max_workers, 1)
+        # Воркеры, ждущие в get(): между ними делится уже накопленная очередь
+        self._idle_workers = 0
         self._workers: list[asyncio.Task] = []
         self.input_queue: Optional[ThrottledQueue] = None
         self.output_queue: Optional[ThrottledQueue] = None
@@ -18,47 +27,77 @@ class ProcessorStage(BaseStage):
     async def start(self, input_queue: ThrottledQueue, output_queue: Optional[ThrottledQueue] = None) -> None:
         self.input_queue = input_queue
         self.output_queue = output_queue
-        self._stop_event.clear()
         self._workers = [
             asyncio.create_task(self._worker_loop(i), name=f"{self.name}_w{i}")
             for i in range(self.max_workers)
         ]
 
+    def _drain(self, batch: list) -> None:
+        """Добирает в батч уже лежащие в очереди элементы, без ожидания"""
+        # Не больше доли на воркера: остаток разберут простаивающие воркеры,
+        # а не будут ждать, пока один обработает всю пачку
+        fair_share = -(-self.input_queue.qsize // (self._idle_workers + 1))
+        limit = min(self.DRAIN_BATCH_SIZE, len(batch) + fair_share)
+        while len(batch) < limit:
+            try:
+                batch.append(self.input_queue.get_nowait())
+            except asyncio.QueueEmpty:
+                return
+
     async def _worker_loop(self, wid: int) -> None:
-        """Просто: взял → обработал → положил. Без батчинга."""
-        self.log.info(f"[{self.name}] Worker {wid} waiting for item in {self.input_queue.name}...")
-        count = 0
-        while not self._stop_event.is_set():
+        """Просто: взял → обработал → положил. Готовые элементы забираются пачкой до DRAIN_BATCH_SIZE."""
+        self.log.info("[%s] Worker %d waiting for item in %s...", self.name, wid, self.input_queue.name)
+        since_yield = 0
+        # Остановка — только через cancel() из stop(): воркер все равно ждет в get()
+        while True:
+            batch: list = []
             try:
-                count += 1
-                item = await self.input_queue.get()
-                self.log.info(f"[{self.name}] Worker {wid} GOT ITEM from {self.input_queue.name}")
+                # Блокирующий get() только на первый элемент, остальное — дренаж очереди
+                self._idle_workers += 1
+                try:
+                    batch.append(await self.input_queue.get())
+                finally:
+                    self._idle_workers -= 1
+                self._drain(batch)
 
-                if item is None:
-                    self.log.debug(f"[{self.name}] Ignoring poison pill")
-                    self.input_queue.task_done()
+                # Poison pill проверяем сразу после get(), до логов и счетчиков
+                items = [item for item in batch if item is not None]
+                if len(items) != len(batch):
+                    self.log.debug("[%s] Ignoring poison pill", self.name)
+                if not items:
                     continue
 
+                # Лог на каждый элемент — только в debug: filtering logger отбрасывает его без форматирования
+                self.log.debug("[%s] Worker %d GOT %d ITEM(S) from %s", self.name, wid, len(items), self.input_queue.name)
+
                 try:
-                    result = await self.process(item)
-                    if result is not None and self.output_queue:
-                        await self.output_queue.put(result)
+                    results = await self.process_many(items)
+                    if self.output_queue:
+                        await self.output_queue.put_many(result for result in results if result is not None)
                 except Exception:
-                    self.log.exception(f"[{self.name}] Worker {wid} failed during process")
+                    self.log.exception("[%s] Worker %d failed during process", self.name, wid)
                     raise
-                finally:
-                    self.input_queue.task_done()
-                    self.log.debug(f"[{self.name}] Worker {wid} finished handling")
 
-
-                await asyncio.sleep(0)  # ← ВАЖНО
+                since_yield += len(items)
+                if since_yield >= self.YIELD_EVERY:
+                    since_yield = 0
+                    await asyncio.sleep(0)
 
             except asyncio.CancelledError:
-                self.log.info(f"[{self.name}] Worker {wid}: cancelled")
+                self.log.info("[%s] Worker %d: cancelled", self.name, wid)
                 break
             except BaseException as e:
-                self.log.critical(f"[{self.name}] Worker {wid} crashed")
+                self.log.critical("[%s] Worker %d crashed", self.name, wid)
                 raise
+            finally:
+                for _ in batch:
+                    self.input_queue.task_done()
+                if batch:
+                    self.log.debug("[%s] Worker %d finished handling", self.name, wid)
+
+    async def process_many(self, items: List[Any]) -> List[Any]:
+        """Обрабатывает пачку элементов; по умолчанию — process() для каждого по порядку"""
+        return [await self.process(item) for item in items]
 
     async def process(self, item: Any) -> Any:
         """
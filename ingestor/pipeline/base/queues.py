@@ -1,6 +1,6 @@
 import asyncio
 import time
-from typing import Generic, TypeVar, Optional
+from typing import Generic, Iterable, TypeVar, Optional
 
 T = TypeVar('T')
 
@@ -8,6 +8,8 @@ T = TypeVar('T')
 class ThrottledQueue(Generic[T]):
     """Очередь с обратным давлением и метриками"""
 
+    __slots__ = ('queue', 'maxsize', 'throttle_delay', 'name', 'log', 'metrics', '_throttle_size')
+
     def __init__(
             self,
             maxsize: int = 1000,
@@ -17,6 +19,8 @@ class ThrottledQueue(Generic[T]):
         from infra.logger import get_logger
         self.queue = asyncio.Queue(maxsize=maxsize)
         self.maxsize = maxsize
+        # Порог обратного давления (80% емкости) считается один раз, а не на каждый put
+        self._throttle_size = maxsize * 0.8
         self.throttle_delay = throttle_delay
         self.name = name
         self.log = get_logger(f'ingestor.queue.{name}')
@@ -31,30 +35,61 @@ class ThrottledQueue(Generic[T]):
 
     async def put(self, item: Optional[T]) -> None:
         """Добавляет элемент с обратным давлением"""
-        start = time.time()
+        # Быстрый путь: очередь далека от заполнения — без замеров времени и ожидания
+        if self.queue.qsize() <= self._throttle_size:
+            self.queue.put_nowait(item)
+            self.metrics['put_count'] += 1
+            return
+
+        start = time.monotonic()
 
         # Обратное давление при заполнении очереди
-        if self.qsize > self.maxsize * 0.8:
-            await asyncio.sleep(self.throttle_delay)
-            self.metrics['last_throttle'] = time.time()
+        await asyncio.sleep(self.throttle_delay)
+        self.metrics['last_throttle'] = time.monotonic()
 
         await self.queue.put(item)
         self.metrics['put_count'] += 1
         self.metrics['max_wait_time'] = max(
             self.metrics['max_wait_time'],
-            time.time() - start
+            time.monotonic() - start
+        )
+
+    async def put_many(self, items: Iterable[Optional[T]]) -> None:
+        """Добавляет пачку элементов: одна проверка давления, ожидание только при полной очереди"""
+        start = time.monotonic()
+
+        if self.queue.qsize() > self._throttle_size:
+            await asyncio.sleep(self.throttle_delay)
+            self.metrics['last_throttle'] = time.monotonic()
+
+        count = 0
+        for item in items:
+            try:
+                self.queue.put_nowait(item)
+            except asyncio.QueueFull:
+                await self.queue.put(item)
+            count += 1
+        self.metrics['put_count'] += count
+        self.metrics['max_wait_time'] = max(
+            self.metrics['max_wait_time'],
+            time.monotonic() - start
         )
 
     async def get(self) -> Optional[T]:
         """Берет элемент из очереди"""
-        self.metrics['get_start_time'] = time.time()
+        # Быстрый путь: элемент уже есть — без замеров времени ожидания
+        if not self.queue.empty():
+            self.metrics['get_count'] += 1
+            return self.queue.get_nowait()
+
+        self.metrics['get_start_time'] = time.monotonic()
         item = await self.queue.get()
 
 
         self.metrics['get_count'] += 1
         self.metrics['max_wait_time'] = max(
             self.metrics['max_wait_time'],
-            time.time() - self.metrics.get('get_start_time', 0)
+            time.monotonic() - self.metrics.get('get_start_time', 0)
         )
         return item
 
@@ -67,6 +102,17 @@ class ThrottledQueue(Generic[T]):
         except asyncio.QueueEmpty:
             raise  # Пробрасываем оригинальное исключение для совместимости с asyncio.Queue
 
+    def clear(self) -> int:
+        """Выбрасывает оставшиеся элементы (для повторного использования очереди). Возвращает их число"""
+        dropped = 0
+        while True:
+            try:
+                self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return dropped
+            self.queue.task_done()
+            dropped += 1
+
     def task_done(self) -> None:
         """Отмечает задачу выполненной"""
         self.queue.task_done()
@@ -79,4 +125,4 @@ class ThrottledQueue(Generic[T]):
     @property
     def is_full(self) -> bool:
         """Заполнена ли очередь на 80%"""
-        return self.qsize > self.maxsize * 0.8
+        return self.queue.qsize() > self._throttle_size
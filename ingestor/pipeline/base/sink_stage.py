@@ -1,52 +1,94 @@
 import asyncio
 from abc import abstractmethod
-from typing import Optional, Any
+from typing import Any, List, Optional
 
 from ingestor.pipeline.base.queues import ThrottledQueue
 from ingestor.pipeline.base.base_stage import BaseStage
 
 
 class SinkStage(BaseStage):
-    def __init__(self, name: str, max_workers: int = 1):
+    # Сколько уже лежащих в очереди элементов забираем за одно пробуждение воркера
+    DRAIN_BATCH_SIZE = 256
+
+    def __init__(self, name: str, max_workers: int = 1, report_interval: float = 1.0):
         super().__init__(name)
         self.max_workers = max(max_workers, 1)
         self._workers: list[asyncio.Task] = []
         self.input_queue: Optional[ThrottledQueue] = None
+        # Вместо лога на каждый элемент — счетчик и периодический отчет о скорости
+        self.report_interval = report_interval
+        self._processed = 0
 
     async def start(self, input_queue: ThrottledQueue) -> None:
         self.input_queue = input_queue
-        self._stop_event.clear()
         self._workers = [
             asyncio.create_task(self._worker_loop(i), name=f"{self.name}_w{i}")
             for i in range(self.max_workers)
         ]
+        self._task = asyncio.create_task(self._report_loop(), name=f"{self.name}_report")
+
+    async def _report_loop(self) -> None:
+        """Раз в report_interval логирует скорость обработки и размер входной очереди"""
+        last = self._processed
+        while True:
+            await asyncio.sleep(self.report_interval)
+            processed = self._processed
+            if processed != last:
+                self.log.info(
+                    "sink.rate",
+                    stage=self.name,
+                    rate=(processed - last) / self.report_interval,
+                    total=processed,
+                    qsize=self.input_queue.qsize,
+                )
+                last = processed
+
+    def _drain(self, batch: list) -> None:
+        """Добирает в батч все, что уже лежит в очереди, без ожидания"""
+        while len(batch) < self.DRAIN_BATCH_SIZE:
+            try:
+                batch.append(self.input_queue.get_nowait())
+            except asyncio.QueueEmpty:
+                return
 
     async def _worker_loop(self, wid: int) -> None:
-        count = 0
-        while not self._stop_event.is_set():
+        # Остановка — только через cancel() из stop(): воркер все равно ждет в get()
+        while True:
+            batch: list = []
             try:
-                count += 1
-                self.log.debug(f"[{self.name}] Worker {wid}: calling get()...")
-                item = await self.input_queue.get()
-                self.log.info(f"[{self.name}] Worker {wid}: received item #{count}: {type(item).__name__}")
+                self.log.debug("[%s] Worker %s: calling get()...", self.name, wid)
+                # Блокирующий get() только на первый элемент, остальное — дренаж очереди
+                batch.append(await self.input_queue.get())
+                self._drain(batch)
 
-                if item is None:
-                    self.log.info(f"[{self.name}] Worker {wid}: received poison pill, will break")
+                # Poison pill не считается обработанным элементом
+                items = [item for item in batch if item is not None]
+                if len(items) != len(batch):
+                    self.log.info("[%s] Worker %s: received poison pill, ignoring", self.name, wid)
+                if not items:
                     continue
 
-                self.log.debug(f"[{self.name}] Worker {wid}: calling consume()...")
-                await self.consume(item)
-                self.log.debug(f"[{self.name}] Worker {wid}: consume() completed")
+                self._processed += len(items)
+
+                self.log.debug("[%s] Worker %s: calling consume_many(%d)...", self.name, wid, len(items))
+                await self.consume_many(items)
+                self.log.debug("[%s] Worker %s: consume_many() completed", self.name, wid)
 
             except asyncio.CancelledError:
-                self.log.debug(f"[{self.name}] Worker {wid}: received CancelledError")
+                self.log.debug("[%s] Worker %s: received CancelledError", self.name, wid)
                 break
             except Exception:
-                self.log.error(f"Sink worker {wid} error", exc_info=True)
+                self.log.error("Sink worker %s error", wid, exc_info=True)
                 raise
             finally:
-                self.input_queue.task_done()
-                self.log.debug(f"[{self.name}] Worker {wid}: task_done() called")
+                for _ in batch:
+                    self.input_queue.task_done()
+                self.log.debug("[%s] Worker %s: task_done() called", self.name, wid)
+
+    async def consume_many(self, items: List[Any]) -> None:
+        """Обрабатывает пачку элементов; по умолчанию — consume() для каждого"""
+        for item in items:
+            await self.consume(item)
 
 
     @abstractmethod
@@ -55,4 +97,7 @@ class SinkStage(BaseStage):
 
     async def stop(self) -> None:
         await super().stop()
+        for w in self._workers:
+            if not w.done():
+                w.cancel()
         await asyncio.gather(*self._workers, return_exceptions=True)
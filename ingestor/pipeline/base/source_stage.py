@@ -1,44 +1,67 @@
-from abc import abstractmethod, ABC
-from typing import Any, AsyncGenerator, Optional
+from abc import abstractmethod
+from typing import Any, AsyncGenerator, List, Optional
 import asyncio
 
 from infra.logger import get_logger
+from ingestor.pipeline.base.base_stage import BaseStage
 from ingestor.pipeline.base.queues import ThrottledQueue
 
 
-class SourceStage(ABC):
+class SourceStage(BaseStage):
     """Базовая стадия-источник данных"""
 
-    def __init__(self, name: str):
-        self.name = name
+    def __init__(self, name: str, batch_size: int = 64, flush_interval: float = 0.05):
+        super().__init__(name)
         self.log = get_logger(f'ingestor.scanner.{self.__class__.__name__}')
-        self._stop_event = asyncio.Event()  # ← ДОБАВИТЬ
-        self._task: Optional[asyncio.Task] = None
         self.output_queue: Optional[ThrottledQueue] = None
+        # Элементы отправляются в очередь пачками: по batch_size или по таймауту
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending: List[Any] = []
+        self._flush_lock = asyncio.Lock()
 
     async def start(self, output_queue: ThrottledQueue) -> None:
         self.output_queue = output_queue
         self._stop_event.clear()
         self._task = asyncio.create_task(self._run(), name=f"{self.name}_source")
 
+    async def _flush(self) -> None:
+        """Отправляет накопленную пачку одним элементом очереди"""
+        # Лок сохраняет порядок пачек при одновременном сбросе из _run и _flush_loop
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, []
+            await self.output_queue.put(batch)
+
+    async def _flush_loop(self) -> None:
+        """Сбрасывает неполную пачку по таймауту (редкие события inotify)"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self._flush()
+
     async def _run(self) -> None:
-        self.log.info(f"[{self.name}] SourceStage._run() ENTER")
+        self.log.info("[%s] SourceStage._run() ENTER", self.name)
         count = 0
+        flusher = asyncio.create_task(self._flush_loop(), name=f"{self.name}_flusher")
         try:
             async for item in self.generate():
                 count += 1
                 if self._stop_event.is_set():
                     break
-                print("PUT")
-                await self.output_queue.put(item)
+                self._pending.append(item)
+                if len(self._pending) >= self.batch_size:
+                    await self._flush()
+            await self._flush()
         except asyncio.CancelledError:
-            self.log.info(f"[{self.name}] CancelledError")
+            self.log.info("[%s] CancelledError", self.name)
             raise
         except Exception as e:
-            self.log.error(f"[{self.name}] Exception: {e}", exc_info=True)
+            self.log.error("[%s] Exception: %s", self.name, e, exc_info=True)
             raise
         finally:
-            self.log.info(f"[{self.name}] SourceStage._run() FINALLY, total: {count}")
+            flusher.cancel()
+            self.log.info("[%s] SourceStage._run() FINALLY, total: %s", self.name, count)
 
     async def is_running(self) -> bool:
         return self._task is not None and not self._task.done()
@@ -59,13 +82,7 @@ class SourceStage(ABC):
 
     async def stop(self) -> None:
         """Останавливает генерацию"""
-        self.log.info(f"[{self.name}] Stopping")
-        self._stop_event.set()
-        if self._task and not self._task.done():
-            self._task.cancel()
-            try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
+        self.log.info("[%s] Stopping", self.name)
+        await super().stop()
         self._task = None
-        self.log.info(f"[{self.name}] Stopped")
+        self.log.info("[%s] Stopped", self.name)
@@ -1,4 +1,5 @@
-from typing import List
+from functools import lru_cache
+from typing import Tuple
 
 from ingestor.pipeline.models.stage_def import StageDef
 from ingestor.pipeline.stages.enrich_stage import EnrichStage
@@ -14,8 +15,10 @@ class IndexationPipelineBuilder:
     """Отвечает за описание структуры пайплайна"""
 
     @staticmethod
-    def get_default_definitions() -> List[StageDef]:
-        return [
+    @lru_cache(maxsize=1)
+    def get_default_definitions() -> Tuple[StageDef, ...]:
+        """Описания стадий не зависят от контекста — строятся один раз на процесс"""
+        return (
             StageDef(
                 name="filter",
                 stage_class=IncrementalFilterStage,
@@ -60,7 +63,11 @@ class IndexationPipelineBuilder:
                     embed_model=ctx.embed_model,
                     batch_size=ctx.config.get("indexing_batch_size", 100),
                     max_workers=ctx.config.get("indexing_workers", 2)
-                )
+                ),
+                # Контексты перед эмбеддингом держат все узлы файла — не копим их впрок
+                input_queue_size=2,
+                # Без модели эмбеддингов или векторного хранилища индексировать нечем
+                enabled=lambda ctx: ctx.embed_model is not None and ctx.vector_store is not None
             ),
             # File summary stage - creates file_summary records with LLM-generated summary
             StageDef(
@@ -71,7 +78,9 @@ class IndexationPipelineBuilder:
                     workspace_path=ctx.workspace_path,
                     llm=ctx.llm,
                     lock_manager=ctx.lock_manager,
-                    max_workers=ctx.config.get("file_summary_workers", 2)
+                    max_workers=ctx.config.get("file_summary_workers", 2),
+                    checksum_algo=ctx.config.get("checksum_algo", "xxh3"),
+                    checksum_io_depth=ctx.config.get("checksum_io_depth")
                 )
             ),
             # Module summary stage - aggregates file summaries into module-level summaries
@@ -86,4 +95,4 @@ class IndexationPipelineBuilder:
                     max_workers=ctx.config.get("file_summary_workers", 2)  # reuse same workers
                 )
             ),
-        ]
+        )
@@ -1,13 +1,14 @@
 import asyncio
 import time
+from collections import deque
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Any, Deque, Dict, Optional, Tuple
 
 from infra.logger import get_logger
 
 
-@dataclass
+@dataclass(slots=True)
 class StageMetrics:
     """Метрики одной стадии конвейера"""
     name: str
@@ -29,12 +30,13 @@ class StageMetrics:
     @property
     def throughput(self) -> float:
         """Пропускная способность (элементы/секунду)"""
-        if self.duration > 0:
-            return self.processed / self.duration
+        duration = self.duration
+        if duration > 0:
+            return self.processed / duration
         return 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class QueueMetrics:
     """Метрики очереди"""
     name: str
@@ -49,6 +51,9 @@ class QueueMetrics:
 class PipelineMetrics:
     """Сбор и агрегация метрик всего конвейера"""
 
+    # Сколько последних событий хранить для отладки
+    EVENTS_LIMIT = 10_000
+
     def __init__(self, pipeline_name: str = "scanner_pipeline"):
         self.pipeline_name = pipeline_name
         self.start_time: Optional[float] = None
@@ -66,23 +71,23 @@ class PipelineMetrics:
         self.total_files_changed: int = 0
         self.total_errors: int = 0
 
-        # События (для отладки)
-        self.events: List[Dict] = []
+        # События (для отладки): кольцевой буфер (timestamp, type, data), старые вытесняются
+        self.events: Deque[Tuple[float, str, Dict[str, Any]]] = deque(maxlen=self.EVENTS_LIMIT)
 
     def start(self) -> None:
         """Начало работы конвейера"""
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         self._log_event("pipeline_started", {"time": self.start_time})
 
     def stop(self) -> None:
         """Окончание работы конвейера"""
-        self.end_time = time.time()
+        self.end_time = time.monotonic()
         self._log_event("pipeline_stopped", {"time": self.end_time})
 
     def add_stage(self, stage_name: str) -> StageMetrics:
         """Добавляет метрики для стадии"""
         stage_metrics = StageMetrics(name=stage_name)
-        stage_metrics.start_time = time.time()
+        stage_metrics.start_time = time.monotonic()
         self.stages[stage_name] = stage_metrics
         self._log_event("stage_added", {"stage": stage_name})
         return stage_metrics
@@ -90,7 +95,7 @@ class PipelineMetrics:
     def complete_stage(self, stage_name: str) -> None:
         """Отмечает завершение стадии"""
         if stage_name in self.stages:
-            self.stages[stage_name].end_time = time.time()
+            self.stages[stage_name].end_time = time.monotonic()
             self._log_event("stage_completed", {
                 "stage": stage_name,
                 "duration": self.stages[stage_name].duration
@@ -153,7 +158,7 @@ class PipelineMetrics:
         if not self.start_time:
             return {}
 
-        end_time = self.end_time or time.time()
+        end_time = self.end_time or time.monotonic()
         total_duration = end_time - self.start_time
 
         return {
@@ -168,15 +173,7 @@ class PipelineMetrics:
             "total_files_changed": self.total_files_changed,
             "total_errors": self.total_errors,
             "stages": {
-                name: {
-                    "processed": stage.processed,
-                    "filtered": stage.filtered,
-                    "errors": stage.errors,
-                    "duration": stage.duration,
-                    "throughput": stage.throughput,
-                    "processing_time": stage.processing_time,
-                    "queue_wait_time": stage.queue_wait_time
-                }
+                name: self._stage_summary(stage)
                 for name, stage in self.stages.items()
             },
             "queues": {
@@ -195,6 +192,20 @@ class PipelineMetrics:
             }
         }
 
+    @staticmethod
+    def _stage_summary(stage: StageMetrics) -> Dict:
+        # duration считается один раз: throughput через свойство посчитал бы ее повторно
+        duration = stage.duration
+        return {
+            "processed": stage.processed,
+            "filtered": stage.filtered,
+            "errors": stage.errors,
+            "duration": duration,
+            "throughput": stage.processed / duration if duration > 0 else 0.0,
+            "processing_time": stage.processing_time,
+            "queue_wait_time": stage.queue_wait_time
+        }
+
     def print_summary(self) -> None:
         """Выводит сводку метрик в консоль"""
         summary = self.get_summary()
@@ -234,23 +245,19 @@ class PipelineMetrics:
 
     def _log_event(self, event_type: str, data: Dict) -> None:
         """Логирует событие для отладки"""
-        self.events.append({
-            "timestamp": time.time(),
-            "type": event_type,
-            "data": data
-        })
+        self.events.append((time.monotonic(), event_type, data))
 
 
 @asynccontextmanager
 async def measure_stage(metrics: PipelineMetrics, stage_name: str):
     """Контекстный менеджер для измерения времени стадии"""
     stage_metrics = metrics.add_stage(stage_name)
-    start_time = time.time()
+    start_time = time.monotonic()
 
     try:
         yield stage_metrics
     finally:
-        stage_metrics.end_time = time.time()
+        stage_metrics.end_time = time.monotonic()
         metrics.complete_stage(stage_name)
 
 
@@ -1,5 +1,4 @@
 import asyncio
-from dataclasses import replace
 from typing import Optional, Set
 
 from .builder import IndexationPipelineBuilder
@@ -22,11 +21,19 @@ class IndexationPipeline(BasePipeline):
     }
 
     def __init__(self, pipeline_context: PipelineContext):
-        super().__init__(
-            replace(pipeline_context, config={**pipeline_context.config, **IndexationPipeline.DEFAULT_CONFIG})
-        )
-
-        self._stage_defs = IndexationPipelineBuilder.get_default_definitions()
+        # BasePipeline сливает self.DEFAULT_CONFIG с config контекста; значения пользователя важнее
+        super().__init__(pipeline_context)
+
+        # Отключенные стадии исключаем из цепочки целиком, а не пропускаем элементы насквозь
+        self._stage_defs = []
+        skipped = []
+        for defn in IndexationPipelineBuilder.get_default_definitions():
+            if defn.is_enabled(self._ctx):
+                self._stage_defs.append(defn)
+            else:
+                skipped.append(defn.name)
+        if skipped:
+            self.log.info("pipeline.stages.disabled", stages=skipped)
         self._sources: Set[SourceStage] = set()
         self._sink: Optional[IndexerSinkStage] = None
 
@@ -34,9 +41,16 @@ class IndexationPipeline(BasePipeline):
         if self._running: return
         self._running = True
 
-        # 1. Создаем очереди
-        num_queues = len(self._stage_defs) + 1
-        self._queues = [ThrottledQueue(self.config['queue_size'], name=f"q_{i}") for i in range(num_queues)]
+        # 1. Создаем очереди: i-я очередь — вход i-й стадии, последняя — вход sink
+        queue_size = self.config['queue_size']
+        sizes = [min(queue_size, defn.input_queue_size or queue_size) for defn in self._stage_defs]
+        sizes.append(queue_size)
+        if [q.maxsize for q in self._queues] == sizes:
+            # Перезапуск: очереди прежней конфигурации переиспользуем, выбросив хвост прошлого запуска
+            for q in self._queues:
+                q.clear()
+        else:
+            self._queues = [ThrottledQueue(size, name=f"q_{i}") for i, size in enumerate(sizes)]
 
         # 2. Строим стадии через фабрики
         for i, defn in enumerate(self._stage_defs):
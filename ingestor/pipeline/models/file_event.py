@@ -4,13 +4,13 @@ from typing import Literal, Optional, get_args
 
 EventTypes = Literal["create", "modify", "delete", "scan", "rename"]
 
-@dataclass
+@dataclass(slots=True)
 class FileEvent:
     """Унифицированное событие файла"""
     path: Path                    # Относительный путь к файлу
     event_type: EventTypes
     abs_path: Optional[Path] = None  # Абсолютный путь (для удобства)
-    EVENT_TYPES = get_args(EventTypes)
+    EVENT_TYPES = frozenset(get_args(EventTypes))
 
 
     def __post_init__(self):
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from pathlib import Path
 
 
-@dataclass
+@dataclass(slots=True)
 class FileInfo:
     """Информация о файле для обработки в конвейере"""
     path: Path
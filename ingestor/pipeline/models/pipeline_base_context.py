@@ -13,8 +13,10 @@ import time
 from ingestor.core.models.chunk import Chunk
 
 PipelineContextStatus = Literal["none", "pending", "success", "skipped", "error"]
+# Статусы, при которых контекст идет дальше по стадиям
+PROCESSABLE_STATUSES = frozenset(("pending", "success"))
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class PipelineBaseContext:
     """
     Абстрактный базовый класс для контекстов пайплайнов.
@@ -30,18 +32,18 @@ class PipelineBaseContext:
     chunks: List['Chunk'] = None
 
     # Статус обработки (должен быть определен в дочерних классах)
-    status: PipelineContextStatus = ''
+    status: PipelineContextStatus = "none"
 
     # Сообщение об ошибке
     error: Optional[str] = None
 
-    # Флаги ошибок
+    # Флаги ошибок; список создается при первой ошибке — у большинства контекстов их нет
     has_errors: bool = False
-    errors: List[str] = field(default_factory=list)
+    errors: Optional[List[str]] = None
 
-    # Временные метки
-    created_at: float = field(default_factory=time.time)
-    updated_at: float = field(default_factory=time.time)
+    # Временные метки: монотонные часы в наносекундах — только для интервалов и порядка
+    created_at: int = field(default_factory=time.monotonic_ns)
+    updated_at: int = field(default_factory=time.monotonic_ns)
 
     @abstractmethod
     def mark_success(self) -> None:
@@ -58,6 +60,14 @@ class PipelineBaseContext:
         """Отметить ошибку обработки."""
         pass
 
+    def add_error(self, error: str) -> None:
+        """Добавить ошибку без смены статуса."""
+        self.has_errors = True
+        if self.errors is None:
+            self.errors = [error]
+        else:
+            self.errors.append(error)
+
     def is_processable(self) -> bool:
         """
         Проверка готовности к обработке.
@@ -67,14 +77,15 @@ class PipelineBaseContext:
         - нет критических ошибок
         - есть хотя бы один валидный чанк
         """
-        return self.status in ("pending", "success") and not self.has_errors
+        return not self.has_errors and self.status in PROCESSABLE_STATUSES
 
     def has_valid_chunks(self) -> bool:
         """
         Есть ли валидные чанки для обработки.
 
         Чанк считается валидным, если он содержит непустой контент.
+        isspace() проверяет строку без копии, в отличие от strip().
         """
-        return len(self.chunks) > 0 and any(
-            c.content and c.content.strip() for c in self.chunks
+        return any(
+            c.content and not c.content.isspace() for c in self.chunks or ()
         )
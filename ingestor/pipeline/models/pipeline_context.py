@@ -9,7 +9,7 @@ from ingestor.pipeline.utils.text_splitter_helper import TextSplitterHelper
 from ingestor.services.lock import LLMLockManager
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PipelineContext:
     """Контекст с зависимостями, передаваемый фабрикам стадий"""
     
@@ -10,13 +10,13 @@ from pathlib import Path
 from typing import List, Optional
 import time
 
-from ingestor.core.models.chunk import Chunk
 
 # Import from pipeline base
+from .file_event import EventTypes
 from .pipeline_base_context import PipelineBaseContext
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class PipelineFileContext(PipelineBaseContext):
     """
     Контекст для индексационного пайплайна.
@@ -31,9 +31,10 @@ class PipelineFileContext(PipelineBaseContext):
     Добавляет специфичные поля:
     - file_path: относительный путь к файлу
     - abs_path: абсолютный путь к файлу
-    - event_type: тип события (scan, inotify, full_scan)
+    - event_type: тип события (create, modify, delete, scan, rename)
     - size: размер файла
     - mtime: время модификации
+    - mtime_ns: время модификации в наносекундах (точное сравнение; 0 — неизвестно)
     - raw_event: исходное событие (опционально)
     - nodes: список TextNode объектов (новый формат)
     """
@@ -41,32 +42,29 @@ class PipelineFileContext(PipelineBaseContext):
     # Специфичные поля для file pipeline
     file_path: Path
     abs_path: Path
-    event_type: str
+    event_type: EventTypes
     size: int = 0
     mtime: float = 0
+    mtime_ns: int = 0
     raw_event: Optional[dict] = None
     
     # New: TextNode objects (preferred)
     nodes: List["TextNode"] = field(default_factory=list)
-    
-    # Legacy: Chunk objects (for backwards compatibility, to be removed)
-    chunks: List[Chunk] = field(default_factory=list)
 
     def mark_success(self) -> None:
         """Отметить успешную обработку."""
         self.status = "success"
-        self.updated_at = time.time()
+        self.updated_at = time.monotonic_ns()
 
     def mark_skipped(self, reason: str = "") -> None:
         """Отметить пропуск обработки."""
         self.status = "skipped"
         self.error = reason
-        self.updated_at = time.time()
+        self.updated_at = time.monotonic_ns()
 
     def mark_error(self, error: str) -> None:
         """Отметить ошибку обработки."""
         self.status = "error"
         self.error = error
-        self.has_errors = True
-        self.errors.append(error)
-        self.updated_at = time.time()
+        self.add_error(error)
+        self.updated_at = time.monotonic_ns()
@@ -15,7 +15,7 @@ from ingestor.core.models.chunk import Chunk
 from .pipeline_base_context import PipelineBaseContext
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class PipelineSearchContext(PipelineBaseContext):
     """
     Контекст для поискового пайплайна.
@@ -39,18 +39,17 @@ class PipelineSearchContext(PipelineBaseContext):
     def mark_success(self) -> None:
         """Отметить успешную обработку."""
         self.status = "success"
-        self.updated_at = time.time()
+        self.updated_at = time.monotonic_ns()
 
     def mark_skipped(self, reason: str = "") -> None:
         """Отметить пропуск обработки."""
         self.status = "skipped"
         self.error = reason
-        self.updated_at = time.time()
+        self.updated_at = time.monotonic_ns()
 
     def mark_error(self, error: str) -> None:
         """Отметить ошибку обработки."""
         self.status = "error"
         self.error = error
-        self.has_errors = True
-        self.errors.append(error)
-        self.updated_at = time.time()
+        self.add_error(error)
+        self.updated_at = time.monotonic_ns()
@@ -1,10 +1,11 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class ScannedFile:
     """Результат сканирования одного файла."""
     path: str
     relative_path: str
     size_bytes: int
     extension: str
+    mtime: float = 0.0
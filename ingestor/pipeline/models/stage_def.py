@@ -1,13 +1,21 @@
 from dataclasses import dataclass
-from typing import Type, Callable
+from typing import Type, Callable, Optional
 
 from ingestor.pipeline.base.base_stage import BaseStage
 from ingestor.pipeline.base.processor_stage import ProcessorStage
 from ingestor.pipeline.models.pipeline_context import PipelineContext
 
 
-@dataclass
+@dataclass(frozen=True)
 class StageDef:
     name: str
     stage_class: Type[ProcessorStage|BaseStage]
     factory: Callable[[PipelineContext], ProcessorStage|BaseStage]
+    # Размер входной очереди стадии (не больше общего queue_size).
+    # Маленький буфер перед тяжелой стадией ограничивает число объектов в памяти
+    input_queue_size: Optional[int] = None
+    # Предикат по контексту: False — стадия не строится и не получает свою очередь
+    enabled: Optional[Callable[[PipelineContext], bool]] = None
+
+    def is_enabled(self, ctx: PipelineContext) -> bool:
+        return self.enabled is None or self.enabled(ctx)
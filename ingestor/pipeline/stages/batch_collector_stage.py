@@ -13,62 +13,54 @@ class BatchCollectorStage(ProcessorStage):
         super().__init__("batch_collector", max_workers=1)
         self.batch_size = batch_size
         self.max_wait = max_wait
-        self._buffer: List[List[Chunk]] = []
-        self._lock = asyncio.Lock()
-        self._flush_event = asyncio.Event()
 
     async def start(self, input_queue: ThrottledQueue, output_queue: Optional[ThrottledQueue] = None) -> None:
         self.input_queue = input_queue
         self.output_queue = output_queue
         self._stop_event.clear()
-        # Два таска: collector и flusher
-        self._workers = [
-            asyncio.create_task(self._collect_loop(), name="collector"),
-            asyncio.create_task(self._flush_loop(), name="flusher"),
-        ]
+        # Один канал: блокирующий get() на первый элемент, затем неблокирующий дренаж очереди
+        self._workers = [asyncio.create_task(self._collect_loop(), name="collector")]
+
+    def _drain(self, batch: List[List[Chunk]]) -> bool:
+        """Добирает в батч все, что уже лежит в очереди. Возвращает True при poison pill."""
+        while len(batch) < self.batch_size:
+            try:
+                item = self.input_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return False
+            if item is None:
+                return True
+            batch.append(item)  # item = List[Chunk]
+            self.input_queue.task_done()
+        return False
 
     async def _collect_loop(self):
-        """Собирает чанки в буфер"""
+        """Собирает чанки в батчи и отправляет их дальше"""
         while not self._stop_event.is_set():
             try:
                 item = await self.input_queue.get()
-
                 if item is None:
-                    async with self._lock:
-                        if self._buffer:
-                            await self._flush()
                     await self.output_queue.put(None)
                     break
 
-                async with self._lock:
-                    self._buffer.append(item)  # item = List[Chunk]
-                    if len(self._buffer) >= self.batch_size:
-                        self._flush_event.set()
-
+                batch = [item]
                 self.input_queue.task_done()
+                stopped = self._drain(batch)
 
-            except asyncio.CancelledError:
-                break
+                # Неполный батч ждет один раз max_wait (debounce), а не таймаут на каждый элемент
+                if not stopped and len(batch) < self.batch_size:
+                    await asyncio.sleep(self.max_wait)
+                    stopped = self._drain(batch)
 
-    async def _flush_loop(self):
-        """Периодически сливает буфер по таймауту"""
-        while not self._stop_event.is_set():
-            try:
-                await asyncio.wait_for(self._flush_event.wait(), timeout=self.max_wait)
-            except asyncio.TimeoutError:
-                pass
+                # Отправляем батч как один элемент
+                await self.output_queue.put(batch)  # List[List[Chunk]]
 
-            async with self._lock:
-                if self._buffer:
-                    await self._flush()
-                self._flush_event.clear()
+                if stopped:
+                    await self.output_queue.put(None)
+                    break
 
-    async def _flush(self):
-        """Сливает буфер в выходную очередь"""
-        batch = self._buffer[:self.batch_size]
-        self._buffer = self._buffer[self.batch_size:]
-        # Отправляем батч как один элемент
-        await self.output_queue.put(batch)  # List[List[Chunk]]
+            except asyncio.CancelledError:
+                break
 
     async def stop(self):
         await super().stop()
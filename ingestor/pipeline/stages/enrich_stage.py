@@ -1,28 +1,48 @@
-import asyncio
 from pathlib import Path
+from typing import List
 
 from ingestor.pipeline.base.processor_stage import ProcessorStage
 from ingestor.pipeline.models.pipeline_file_context import PipelineFileContext
+from ingestor.pipeline.utils.file_stat import StatResult, stat_many
 
 
 class EnrichStage(ProcessorStage):
+    # Вся работа стадии — stat(): пачка файлов обрабатывается одним заходом в пул потоков
+    DRAIN_BATCH_SIZE = 64
+
     def __init__(self, workspace_path: Path, max_workers: int = 2):
         super().__init__("enrich", max_workers)
         self.workspace_path = Path(workspace_path).resolve()
 
     async def process(self, context: PipelineFileContext) -> PipelineFileContext:
-        if not context.abs_path or not context.abs_path.exists():
-            context.mark_skipped("file not found")
-            return context
+        return (await self.process_many([context]))[0]
+
+    async def process_many(self, items: List[PipelineFileContext]) -> List[PipelineFileContext]:
+        pending = []
+        for context in items:
+            if not context.abs_path:
+                context.mark_skipped("file not found")
+                continue
 
-        self.log.info(f"[enrich_stage] enriching file ({context.event_type}) {context.file_path}")
+            self.log.debug("[enrich_stage] enriching file (%s) %s", context.event_type, context.file_path)
 
-        try:
-            stat = await asyncio.to_thread(context.abs_path.stat)
+            # mtime/size уже получены сканером при обходе директорий
+            if context.event_type == "scan" and context.mtime:
+                continue
+            pending.append(context)
+
+        stats = await stat_many([context.abs_path for context in pending])
+        for context in pending:
+            self._apply_stat(context, stats[context.abs_path])
+        return items
+
+    def _apply_stat(self, context: PipelineFileContext, stat: StatResult) -> None:
+        if isinstance(stat, FileNotFoundError):
+            context.mark_skipped("file not found")
+        elif isinstance(stat, Exception):
+            self.log.critical("stat() FAILED: %s", context.file_path, exc_info=stat)
+            context.mark_error(f"stat failed: {stat}")
+        else:
             context.size = stat.st_size
             context.mtime = stat.st_mtime
-            return context
-        except Exception as e:
-            self.log.critical("stat() FAILED: %s", context.file_path, exc_info=True)
-            context.mark_error(f"stat failed: {e}")
-            return context
\ No newline at end of file
+            context.mtime_ns = stat.st_mtime_ns
@@ -1,5 +1,4 @@
 import asyncio
-import hashlib
 import time
 from pathlib import Path
 
@@ -7,24 +6,41 @@ from ingestor.adapters import BaseStorage
 from ingestor.core.models.file_summary import FileSummary
 from ingestor.pipeline.base.processor_stage import ProcessorStage
 from ingestor.pipeline.models.pipeline_file_context import PipelineFileContext
+from ingestor.pipeline.utils.checksum import (
+    configure_hash_io_depth,
+    file_checksum_async,
+    resolve_checksum_algo,
+    split_checksum,
+    stat_and_checksum_async,
+)
 from ingestor.services.summary_generator import SummaryGenerator
 from infra.logger import get_logger
 
 
 class FileSummaryStage(ProcessorStage):
+    # Предел локального кэша сумм; при переполнении вытесняются самые старые записи
+    HASH_CACHE_SIZE = 50_000
+
     def __init__(
         self, 
         storage: BaseStorage, 
         workspace_path: Path, 
         llm,  # LLM instance (OpenAILike)
         lock_manager,  # LLMLockManager
-        max_workers: int = 2
+        max_workers: int = 2,
+        checksum_algo: str = "xxh3",
+        checksum_io_depth: int | None = None
     ):
         super().__init__("file_summary", max_workers)
         self.storage = storage
         self.workspace_path = Path(workspace_path)
         self.summary_generator = SummaryGenerator(llm, lock_manager)
         self.log = get_logger("ingestor.file_summary_stage")
+        self.checksum_algo = resolve_checksum_algo(checksum_algo)
+        if checksum_io_depth:
+            configure_hash_io_depth(checksum_io_depth)
+        # (algo, st_dev, st_ino, st_mtime_ns, st_size) -> checksum; живет между сканами
+        self._hash_cache: dict[tuple[str, int, int, int, int], str] = {}
     
     async def process(self, context: PipelineFileContext) -> PipelineFileContext:
         file_path = str(context.file_path)
@@ -36,24 +52,44 @@ class FileSummaryStage(ProcessorStage):
         # Safety: Only process if file still exists
         # This prevents deleting a file summary that was just created
         # due to race condition with concurrent processing
-        if context.event_type == "delete" or not abs_path.exists():
-            if not abs_path.exists() and context.event_type != "delete":
-                self.log.warning(f"File not found for file_summary: {file_path} (event_type={context.event_type})")
+        stat = new_checksum = existing_summary = None
+        if context.event_type != "delete":
+            try:
+                # Get existing summary if any
+                existing_summary = await self.storage.get_file_summary(file_path)
+                # stat, сверка с сохраненной суммой и хэширование — один заход в пул
+                stat, new_checksum = await stat_and_checksum_async(
+                    abs_path, self.checksum_algo, lambda st: self._known_checksum(existing_summary, st)
+                )
+            except Exception as e:
+                self.log.error(f"Error in FileSummaryStage: {e}", exc_info=True)
+                return context
+
+        if stat is None:
+            if context.event_type != "delete":
+                self.log.warning("File not found for file_summary: %s (event_type=%s)", file_path, context.event_type)
             # Only delete if we have chunks (meaning file was successfully processed)
             # to avoid deleting a just-created summary from a race condition
             if context.has_errors or not context.nodes:
                 await self.storage.delete_file_summary(file_path)
                 await self.storage.delete_chunks_by_file_paths([file_path])
-                self.log.info(f"FileSummary and chunks deleted: {file_path}")
+                self.log.info("FileSummary and chunks deleted: %s", file_path)
             return context
 
+        key = self._cache_key(self.checksum_algo, stat)
+        if key not in self._hash_cache:
+            self._remember_checksum(key, new_checksum)
+
         try:
-            stat = await asyncio.to_thread(abs_path.stat)
-            new_checksum = await self._calc_checksum(abs_path)
-            
-            # Get existing summary if any
-            existing_summary = await self.storage.get_file_summary(file_path)
-            
+            now = time.time()
+            metadata = {
+                "size": stat.st_size,
+                "mtime": stat.st_mtime,
+                "mtime_ns": stat.st_mtime_ns,
+                "checksum": new_checksum,
+                "checksum_algo": self.checksum_algo,
+            }
+
             # Check for errors or empty nodes
             if context.has_errors or not context.nodes:
                 error_reasons = context.errors if context.errors else ["unknown error"]
@@ -62,19 +98,10 @@ class FileSummaryStage(ProcessorStage):
                 # Удаляем чанки, если они есть (файл стал невалидным или был ранее валиден)
                 await self.storage.delete_chunks_by_file_paths([file_path])
                 
-                summary = FileSummary(
-                    file_path=file_path,
-                    summary="",
-                    metadata={
-                        "size": stat.st_size,
-                        "mtime": stat.st_mtime,
-                        "checksum": new_checksum,
-                        "invalid_reason": reason,
-                        "invalid_timestamp": time.time(),
-                        "invalid_count": 1,
-                        "last_summarized_at": time.time(),
-                    }
-                )
+                file_summary_text = ""
+                metadata["invalid_reason"] = reason
+                metadata["invalid_timestamp"] = now
+                metadata["invalid_count"] = 1
             else:
                 # Collect summaries from chunk nodes (NEW: using chunk summaries instead of raw content)
                 chunk_summaries = [
@@ -87,7 +114,9 @@ class FileSummaryStage(ProcessorStage):
                 combined_summaries = "\n".join(chunk_summaries[:20])
                 
                 # Generate summary if we don't have one or file changed
-                force_regenerate = not existing_summary or existing_summary.metadata.get("checksum") != new_checksum
+                force_regenerate = not existing_summary or not await self._checksum_matches(
+                    existing_summary.metadata, abs_path, new_checksum, stat
+                )
                 
                 if force_regenerate:
                     # Generate summary using chunk summaries
@@ -103,34 +132,79 @@ class FileSummaryStage(ProcessorStage):
                     # Keep existing summary
                     file_summary_text = existing_summary.summary
                 
-                summary = FileSummary(
-                    file_path=file_path,
-                    summary=file_summary_text[:500] if file_summary_text else "",  # Limit to 500 chars
-                    metadata={
-                        "size": stat.st_size,
-                        "mtime": stat.st_mtime,
-                        "checksum": new_checksum,
-                        "valid": True,
-                        "last_summarized_at": time.time(),
-                        "chunks_count": len(context.nodes),
-                    }
-                )
+                metadata["valid"] = True
+                metadata["chunks_count"] = len(context.nodes)
+            metadata["last_summarized_at"] = now
+
+            # Один FileSummary на обе ветки
+            summary = FileSummary(
+                file_path=file_path,
+                summary=file_summary_text[:500] if file_summary_text else "",  # Limit to 500 chars
+                metadata=metadata,
+            )
             
             await self.storage.save_file_summary(summary)
-            self.log.info(f"FileSummary updated: {file_path} (valid={not context.has_errors}, summary_len={len(summary.summary)})")
+            self.log.info("FileSummary updated: %s (valid=%s, summary_len=%d)", file_path, not context.has_errors, len(summary.summary))
 
         except Exception as e:
             self.log.error(f"Error in FileSummaryStage: {e}", exc_info=True)
 
         return context
 
-    async def _calc_checksum(self, path: Path) -> str:
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self._sync_hash, path)
+    def _saved_checksum_if_unchanged(self, summary: FileSummary | None, stat) -> str | None:
+        if not summary or not summary.metadata.get("checksum"):
+            return None
+        meta = summary.metadata
+        algo, digest = split_checksum(meta["checksum"], meta.get("checksum_algo", "md5"))
+        # Целые наносекунды сравниваются точно; старые записи без mtime_ns — по float mtime
+        saved_ns = meta.get("mtime_ns")
+        same_mtime = saved_ns == stat.st_mtime_ns if saved_ns else meta.get("mtime") == stat.st_mtime
+        if (
+            algo == self.checksum_algo
+            and meta.get("size") == stat.st_size
+            and same_mtime
+        ):
+            return f"{algo}:{digest}"
+        return None
+
+    def _known_checksum(self, summary: FileSummary | None, stat) -> str | None:
+        """Сумма без чтения файла: из сохраненного summary или из локального кэша (вызывается в потоке пула)."""
+        checksum = self._saved_checksum_if_unchanged(summary, stat)
+        if checksum is None:
+            checksum = self._hash_cache.get(self._cache_key(self.checksum_algo, stat))
+        return checksum
+
+    @staticmethod
+    def _cache_key(algo: str, stat) -> tuple[str, int, int, int, int]:
+        return (algo, stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size)
 
-    def _sync_hash(self, path: Path) -> str:
-        h = hashlib.md5()
-        with open(path, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                h.update(chunk)
-        return h.hexdigest()
+    def _remember_checksum(self, key: tuple[str, int, int, int, int], checksum: str) -> None:
+        if len(self._hash_cache) >= self.HASH_CACHE_SIZE:
+            # FIFO: dict хранит порядок вставки
+            del self._hash_cache[next(iter(self._hash_cache))]
+        self._hash_cache[key] = checksum
+
+    async def _calc_checksum(self, path: Path, algo: str, size: int | None = None) -> str:
+        return await file_checksum_async(path, algo, size)
+
+    async def _cached_checksum(self, path: Path, stat, algo: str) -> str:
+        """Повторные события по неизмененному файлу не перечитывают его: ключ — inode + mtime_ns + size."""
+        key = self._cache_key(algo, stat)
+        checksum = self._hash_cache.get(key)
+        if checksum is None:
+            checksum = await self._calc_checksum(path, algo, stat.st_size)
+            self._remember_checksum(key, checksum)
+        return checksum
+
+    async def _checksum_matches(self, metadata: dict, path: Path, new_checksum: str, stat) -> bool:
+        """Сравнивает с сохраненной суммой того же алгоритма (старые записи без префикса — md5)"""
+        saved_algo, digest = split_checksum(metadata.get("checksum", ""), metadata.get("checksum_algo", "md5"))
+        saved_checksum = f"{saved_algo}:{digest}"
+        if saved_algo == self.checksum_algo:
+            return saved_checksum == new_checksum
+        # После смены алгоритма пересчитываем старым, чтобы не перегенерировать все саммари
+        try:
+            saved_algo = resolve_checksum_algo(saved_algo)
+        except ValueError:
+            return False
+        return saved_checksum == await self._cached_checksum(path, stat, saved_algo)
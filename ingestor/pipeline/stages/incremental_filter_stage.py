@@ -1,9 +1,10 @@
 import asyncio
-from typing import List, Optional
+from typing import List, Optional, Set
 
 from ingestor.pipeline.base.base_stage import BaseStage
 from ingestor.pipeline.base.queues import ThrottledQueue
 from ingestor.pipeline.models.pipeline_file_context import PipelineFileContext
+from ingestor.pipeline.utils.file_stat import stat_many
 from ingestor.adapters import BaseStorage  # Для тип hinted, но storage передается в __init__
 
 
@@ -14,6 +15,9 @@ class IncrementalFilterStage(BaseStage):
     События inotify пропускает немедленно.
     """
 
+    # Сколько батчей проверяется в БД одновременно, пока копится следующий
+    MAX_INFLIGHT_CHECKS = 2
+
     def __init__(self, storage, batch_size: int = 100, max_wait: float = 3.0):
         super().__init__("incremental_filter")
         self.storage: BaseStorage = storage
@@ -22,6 +26,10 @@ class IncrementalFilterStage(BaseStage):
         self._buffer: List[PipelineFileContext] = []
         self._lock = asyncio.Lock()
         self._flush_event = asyncio.Event()
+        self._check_slots = asyncio.Semaphore(self.MAX_INFLIGHT_CHECKS)
+        self._checks: Set[asyncio.Task] = set()
+        # Выставляется по None: flush loop отправляет свой батч и завершается
+        self._draining = False
         self.input_queue: Optional[ThrottledQueue] = None
         self.output_queue: Optional[ThrottledQueue] = None
         self._workers: List[asyncio.Task] = []
@@ -31,6 +39,7 @@ class IncrementalFilterStage(BaseStage):
         self.input_queue = input_queue
         self.output_queue = output_queue
         self._stop_event.clear()
+        self._draining = False
         self._workers = [
             asyncio.create_task(self._main_loop(), name="filter_main"),
             asyncio.create_task(self._flush_loop(), name="filter_flusher"),
@@ -44,25 +53,41 @@ class IncrementalFilterStage(BaseStage):
                 context = await self.input_queue.get()
 
                 if context is None:
-                    async with self._lock:
-                        if self._buffer:
-                            await self._process_and_flush()
+                    # Flush loop может держать батч, ждущий слота в _dispatch (еще не в _checks):
+                    # дожидаемся, пока он его отправит и завершится
+                    self._draining = True
+                    self._flush_event.set()
+                    await asyncio.gather(self._workers[1], return_exceptions=True)
+                    batch = await self._take_batch()
+                    if batch:
+                        await self._dispatch(batch)
+                    # None уходит дальше только после всех батчей в полете
+                    if self._checks:
+                        await asyncio.gather(*self._checks, return_exceptions=True)
                     if self.output_queue:
                         await self.output_queue.put(None)
                     break
 
+                # Источники присылают пачки событий
+                contexts = context if isinstance(context, list) else [context]
+
                 # Логика разделения: inotify - сразу, scan - в батч
-                if context.event_type != "scan":
-                    if self.output_queue:
-                        await self.output_queue.put(context)
-                    self.input_queue.task_done()
-                    continue
+                scanned = []
+                immediate = []
+                for ctx in contexts:
+                    if ctx.event_type != "scan":
+                        immediate.append(ctx)
+                    else:
+                        scanned.append(ctx)
+                if immediate and self.output_queue:
+                    await self.output_queue.put_many(immediate)
 
                 # Добавляем в буфер для сканирования
-                async with self._lock:
-                    self._buffer.append(context)
-                    if len(self._buffer) >= self.batch_size:
-                        self._flush_event.set()
+                if scanned:
+                    async with self._lock:
+                        self._buffer.extend(scanned)
+                        if len(self._buffer) >= self.batch_size:
+                            self._flush_event.set()
 
                 self.input_queue.task_done()
 
@@ -75,71 +100,114 @@ class IncrementalFilterStage(BaseStage):
         """Цикл сброса по таймауту"""
         while not self._stop_event.is_set():
             try:
-                try:
-                    await asyncio.wait_for(self._flush_event.wait(), timeout=self.max_wait)
-                except asyncio.TimeoutError:
-                    pass
-
-                async with self._lock:
-                    if self._buffer:
-                        await self._process_and_flush()
-                    self._flush_event.clear()
+                if not self._draining:
+                    try:
+                        await asyncio.wait_for(self._flush_event.wait(), timeout=self.max_wait)
+                    except asyncio.TimeoutError:
+                        pass
+
+                batch = await self._take_batch()
+                self._flush_event.clear()
+
+                if batch:
+                    await self._dispatch(batch)
+                if self._draining:
+                    break
 
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 self.log.error(f"Error in flush loop: {e}", exc_info=True)
 
-    async def _process_and_flush(self):
+    async def _take_batch(self) -> List[PipelineFileContext]:
+        async with self._lock:
+            batch = self._buffer
+            self._buffer = []
+            return batch
+
+    async def _dispatch(self, batch: List[PipelineFileContext]) -> None:
+        """
+        Запускает проверку батча в фоне (двойная буферизация): пока батч проверяется в БД,
+        следующий уже копится. Ждем только свободный слот — это и есть обратное давление.
+        """
+        await self._check_slots.acquire()
+        task = asyncio.create_task(self._check_batch(batch), name="filter_check")
+        self._checks.add(task)
+        task.add_done_callback(self._check_done)
+
+    def _check_done(self, task: asyncio.Task) -> None:
+        self._checks.discard(task)
+        self._check_slots.release()
+
+    async def _check_batch(self, current_batch: List[PipelineFileContext]) -> None:
         """Обработка батча событий сканирования"""
-        if not self._buffer:
-            return
-
-        current_batch = self._buffer
-        self._buffer = []
-        
         try:
             paths = [str(ctx.file_path) for ctx in current_batch]
             db_metadata = await self.storage.get_files_metadata(paths)
+            # Компактный словарь path -> (mtime, size, mtime_ns): в цикле только распаковка кортежа
+            saved_lookup = {
+                path: (meta.get("mtime", 0), meta.get("size", 0), meta.get("mtime_ns", 0))
+                for path, meta in db_metadata.items()
+            }
+
+            # Сканер уже заполнил mtime/size из DirEntry; для остальных известных файлов
+            # все stat() делаются одним заходом в поток, а не по одному в цикле событий
+            stats = await stat_many([
+                ctx.abs_path for ctx, path_str in zip(current_batch, paths)
+                if not ctx.mtime and ctx.abs_path and path_str in saved_lookup
+            ])
             
-            for ctx in current_batch:
-                path_str = str(ctx.file_path)
-                if path_str not in db_metadata:
+            # Прошедшие фильтр отдаются одной пачкой после проверки всего батча
+            passed = []
+            for ctx, path_str in zip(current_batch, paths):
+                saved = saved_lookup.get(path_str)
+                if saved is None:
                     # Новый файл
-                    if self.output_queue:
-                        await self.output_queue.put(ctx)
+                    passed.append(ctx)
                     continue
                 
-                db_mtime = db_metadata[path_str].get("mtime", 0)
-                try:
-                    if ctx.abs_path and ctx.abs_path.exists():
-                        current_mtime = ctx.abs_path.stat().st_mtime
-                    else:
-                        current_mtime = 0
-                except Exception as e:
-                    self.log.warning("failed.to.get.mtime", path=path_str, error=str(e))
-                    current_mtime = 0
+                db_mtime, db_size, db_mtime_ns = saved
+                current_mtime = 0
+                current_size = 0
+                current_mtime_ns = 0
+                if ctx.mtime:
+                    current_mtime, current_size, current_mtime_ns = ctx.mtime, ctx.size, ctx.mtime_ns
+                elif ctx.abs_path:
+                    st = stats.get(ctx.abs_path)
+                    if isinstance(st, Exception):
+                        # Ошибка одного файла не прерывает батч: файл считается измененным
+                        if not isinstance(st, FileNotFoundError):
+                            self.log.warning("failed.to.get.mtime", path=path_str, error=str(st))
+                    elif st is not None:
+                        current_mtime, current_size, current_mtime_ns = st.st_mtime, st.st_size, st.st_mtime_ns
                 
-                if current_mtime > db_mtime + 0.01:
+                # Быстрая проверка по (size, mtime); 0 в БД — неизвестно (старые записи).
+                # mtime_ns сравнивается точно целыми, иначе — float mtime с допуском
+                if (db_size and current_size != db_size) or (
+                    current_mtime_ns != db_mtime_ns if db_mtime_ns and current_mtime_ns
+                    else current_mtime > db_mtime + 0.01
+                ):
                     # Файл изменился
-                    if self.output_queue:
-                        await self.output_queue.put(ctx)
+                    passed.append(ctx)
                 else:
-                    self.log.debug(f"Skipping unchanged scanned file: {path_str}")
+                    self.log.debug("Skipping unchanged scanned file: %s", path_str)
+
+            if passed and self.output_queue:
+                await self.output_queue.put_many(passed)
             
             self.log.info(f"Filtered scan batch: {len(current_batch)} processed")
 
         except Exception as e:
             self.log.error(f"Error processing batch: {e}", exc_info=True)
             if self.output_queue:
-                for ctx in current_batch:
-                    await self.output_queue.put(ctx)
+                await self.output_queue.put_many(current_batch)
 
     async def stop(self):
         self._stop_event.set()
-        for w in self._workers:
+        tasks = [*self._workers, *self._checks]
+        for w in tasks:
             if not w.done():
                 w.cancel()
-        if self._workers:
-            await asyncio.gather(*self._workers, return_exceptions=True)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
         self.log.info("IncrementalFilterStage stopped")
@@ -1,15 +1,18 @@
-from typing import Any
+from typing import Any, List
 
 from ingestor.pipeline.base.sink_stage import SinkStage
 
 
-class IndexerSinkStage(SinkStage):
-    def __init__(self, max_workers: int = 1):
-        super().__init__("indexer_sink", max_workers)
+class _Preview:
+    """Ленивое усеченное строковое представление элемента для логов"""
+    __slots__ = ("item",)
 
-    async def consume(self, item: Any) -> None:
+    def __init__(self, item: Any):
+        self.item = item
+
+    def __str__(self) -> str:
         try:
-            item_str = str(item)
+            item_str = str(self.item)
 
             # Обрезаем, если текст слишком длинный
             if len(item_str) > 300:
@@ -17,11 +20,20 @@ class IndexerSinkStage(SinkStage):
         except Exception as e:
             # На случай совсем странных объектов (например, с бинарными данными)
             item_str = f"<serialization error: {e}>"
+        return item_str
+
 
-        self.log.info(
-            f"IndexerSink.consume(): type={type(item).__name__}, "
-            f"content={item_str}"
-        )
+class IndexerSinkStage(SinkStage):
+    def __init__(self, max_workers: int = 1):
+        super().__init__("indexer_sink", max_workers)
+
+    async def consume_many(self, items: List[Any]) -> None:
+        # Одна запись лога на пачку; превью элементов — только при включенном debug
+        self.log.debug("IndexerSink.consume_many(): %d items, first=%s", len(items), _Preview(items[0]))
+
+    async def consume(self, item: Any) -> None:
+        # Превью строится только при рендеринге записи, а не на каждый элемент
+        self.log.debug("IndexerSink.consume(): type=%s, content=%s", type(item).__name__, _Preview(item))
         
         # # Try to get length if it's a list/tuple/set
         # if isinstance(item, (list, tuple)):  # Fixed: only list and tuple are indexable
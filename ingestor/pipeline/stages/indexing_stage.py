@@ -39,15 +39,21 @@ class IndexingStage(ProcessorStage):
         if nodes_without_emb:
             self.log.info("indexing.generating_embeddings", count=len(nodes_without_emb))
             try:
-                # Generate embeddings one by one
-                for node in nodes_without_emb:
-                    emb = await self.embed_model.aget_text_embedding(node.text)
-                    node.embedding = emb
+                # Пачками по embed_batch_size вместо запроса на каждый узел. Пачки идут
+                # последовательно: aget_text_embedding_batch по всему списку запускает их
+                # через gather, и на больших файлах все ответы висят в памяти одновременно
+                embed_batch_size = getattr(self.embed_model, "embed_batch_size", 10) or 10
+                for start in range(0, len(nodes_without_emb), embed_batch_size):
+                    batch_nodes = nodes_without_emb[start:start + embed_batch_size]
+                    embeddings = await self.embed_model.aget_text_embedding_batch(
+                        [node.text for node in batch_nodes]
+                    )
+                    for node, emb in zip(batch_nodes, embeddings):
+                        node.embedding = emb
                 self.log.info("indexing.embeddings_generated", count=len(nodes_without_emb))
             except Exception as e:
                 self.log.error("indexing.embedding_failed", error=str(e), exc_info=True)
-                context.has_errors = True
-                context.errors.append(f"embedding generation failed: {str(e)}")
+                context.add_error(f"embedding generation failed: {str(e)}")
                 return context  # Cannot index without embeddings
         
          # Process in batches
@@ -59,8 +65,7 @@ class IndexingStage(ProcessorStage):
                 self.log.debug("indexing.batch.success", batch_start=i, batch_size=len(batch), node_ids_count=len(node_ids))
             except Exception as e:
                 self.log.error("indexing.batch.failed", batch_start=i, batch_size=len(batch), error=str(e), exc_info=True)
-                context.has_errors = True
-                context.errors.append(f"indexing failed at batch {i}: {str(e)}")
+                context.add_error(f"indexing failed at batch {i}: {str(e)}")
                 # Continue with next batch (best-effort)
         
         self.log.info("indexing.complete", file_path=context.file_path, total_nodes=total)
@@ -1,5 +1,8 @@
 import asyncio
+import functools
+import operator
 import os
+from collections import deque
 from pathlib import Path
 from typing import AsyncGenerator, Optional, Dict
 
@@ -12,6 +15,14 @@ from ingestor.pipeline.utils.gitignore_checker import GitignoreChecker
 from ingestor.pipeline.base.source_stage import SourceStage
 
 
+def _group_flags(flag_map: dict[int, EventTypes]) -> tuple[tuple[int, EventTypes], ...]:
+    """Объединяет биты с одинаковым типом события: (маска группы, тип) в порядке первого появления"""
+    groups: dict[EventTypes, int] = {}
+    for flag, name in flag_map.items():
+        groups[name] = groups.get(name, 0) | flag
+    return tuple((mask, name) for name, mask in groups.items())
+
+
 class InotifySourceStage(SourceStage):
     """Inotify с рекурсивным мониторингом и Gitignore фильтрацией"""
 
@@ -24,110 +35,168 @@ class InotifySourceStage(SourceStage):
         flags.MOVED_TO: "create",
     }
 
+    # Объединение всех битов FLAG_MAP, вычисляется один раз
+    _EVENT_MASK: int = functools.reduce(operator.or_, FLAG_MAP)
+    # Биты FLAG_MAP, сгруппированные по типу события, в порядке приоритета FLAG_MAP
+    _MASK_GROUPS: tuple[tuple[int, EventTypes], ...] = _group_flags(FLAG_MAP)
+
+    EVENT_QUEUE_SIZE = 2048
+
     def __init__(self, workspace_path: Path):
         super().__init__("inotify")
         self.workspace_path = Path(workspace_path).resolve()
+        # Префикс с завершающим разделителем для быстрого вычисления относительных путей
+        self._workspace_prefix = os.path.join(str(self.workspace_path), "")
         self.inotify = inotify_simple.INotify()
-        # Храним маппинг wd -> Path для восстановления полных путей
-        self._wd_to_path: Dict[int, Path] = {}
+        # Храним маппинг wd -> путь папки с завершающим разделителем: полный путь
+        # события — конкатенация строк, Path создается только для отданных контекстов
+        self._wd_to_dir: Dict[int, str] = {}
+        # Ограниченный буфер сырых событий между чтением fd и их обработкой
+        self._event_q: asyncio.Queue[inotify_simple.Event] = asyncio.Queue(maxsize=self.EVENT_QUEUE_SIZE)
+        self._dropped_events = 0
 
         self.checker = GitignoreChecker(self.workspace_path)
         # Предварительно загружаем все .gitignore для корректной фильтрации веток
         self._refresh_gitignores()
 
     def _refresh_gitignores(self):
-        for gi in self.workspace_path.rglob('.gitignore'):
-            self.checker.load_spec_for_dir(gi.parent)
+        """Итеративный обход через os.scandir с отсечением игнорируемых папок"""
+        stack = deque([str(self.workspace_path)])
+        while stack:
+            dir_path = stack.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+
+            # Сначала правила текущей папки, чтобы сразу отсечь её игнорируемые подпапки
+            if any(e.name == '.gitignore' and e.is_file(follow_symlinks=False) for e in entries):
+                self.checker.load_spec_for_dir(Path(dir_path))
 
-    def _add_watch_recursive(self, path: Path):
+            for entry in entries:
+                if not entry.is_dir(follow_symlinks=False) or entry.name == '.git':
+                    continue
+                if self.checker.should_ignore(entry.path, is_dir=True):
+                    continue
+                stack.append(entry.path)
+
+    def _add_watch_recursive(self, path: str | Path):
         """Рекурсивно добавляет папки в мониторинг, учитывая игнорирование"""
         for root, dirs, files in os.walk(path):
-            root_path = Path(root)
-
             # Фильтруем директории на лету, чтобы не вешать лишние вотчеры
-            dirs[:] = [d for d in dirs if not self.checker.should_ignore(root_path / d, is_dir=True)]
+            dirs[:] = [d for d in dirs if not self.checker.should_ignore(os.path.join(root, d), is_dir=True)]
 
             wd = self.inotify.add_watch(
                 root,
                 mask=(flags.CREATE | flags.DELETE | flags.MODIFY |
                       flags.MOVED_FROM | flags.MOVED_TO | flags.CLOSE_WRITE | flags.ONLYDIR)
             )
-            self._wd_to_path[wd] = root_path
+            self._wd_to_dir[wd] = os.path.join(root, "")
+
+    def _enqueue_event(self, event: inotify_simple.Event) -> None:
+        """Кладёт сырое событие в очередь, при переполнении вытесняет самое старое"""
+        if self._event_q.full():
+            try:
+                self._event_q.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            self._dropped_events += 1
+            if self._dropped_events % 100 == 1:
+                self.log.warning("inotify.event_queue.overflow", dropped=self._dropped_events)
+        self._event_q.put_nowait(event)
+
+    def _on_readable(self) -> None:
+        """Вызывается циклом событий, когда в inotify fd есть данные; read не блокирует"""
+        try:
+            events = self.inotify.read(timeout=0)
+        except OSError as e:
+            self.log.error("inotify.read.failed", error=str(e))
+            return
+        for event in events:
+            self._enqueue_event(event)
+
+    def _handle_event(self, event: inotify_simple.Event) -> Optional[PipelineFileContext]:
+        parent_dir = self._wd_to_dir.get(event.wd)
+        if not parent_dir:
+            return None
+
+        abs_str = parent_dir + event.name if event.name else parent_dir[:-1]
+        is_dir = bool(event.mask & flags.ISDIR)
+
+        # 1. Если это новый .gitignore — обновляем правила
+        if not is_dir and event.name == '.gitignore':
+            self.checker.load_spec_for_dir(Path(parent_dir))
+
+        # 2. Проверка игнорирования
+        if self.checker.should_ignore(abs_str, is_dir=is_dir):
+            return None
+
+        # 3. Если создана новая папка — добавляем её в мониторинг
+        if is_dir:
+            if event.mask & (flags.CREATE | flags.MOVED_TO):
+                self._add_watch_recursive(abs_str)
+            return None
+
+        # 4. Маппинг события для файлов
+        event_type = self._map_mask(event.mask)
+        if not event_type:
+            return None
+        rel_path = self._relative_path(abs_str)
+        if rel_path is None:
+            return None
+        return PipelineFileContext(
+            file_path=rel_path,
+            abs_path=Path(abs_str),
+            event_type=event_type,
+            status="pending"
+        )
 
     async def _read_loop(self) -> AsyncGenerator[PipelineFileContext, None]:
         self.log.info("[inotify] _read_loop STARTED")
 
-        while not self._stop_event.is_set():
-            # Таймаут 0 позволяет не блокировать поток, но требует asyncio.sleep
-            events = self.inotify.read(timeout=0)
-
-            if not events:
-                await asyncio.sleep(1.0)
-                continue
-
-            for event in events:
+        # fd регистрируется в цикле событий: пробуждение только по приходу данных,
+        # без потока и таймаута опроса
+        loop = asyncio.get_running_loop()
+        fd = self.inotify.fileno()
+        loop.add_reader(fd, self._on_readable)
+        try:
+            while not self._stop_event.is_set():
+                event = await self._event_q.get()
                 try:
-                    parent_path = self._wd_to_path.get(event.wd)
-                    if not parent_path:
-                        continue
-
-                    abs_path = parent_path / event.name
-                    is_dir = bool(event.mask & flags.ISDIR)
-
-                    # 1. Если это новый .gitignore — обновляем правила
-                    if not is_dir and event.name == '.gitignore':
-                        self.checker.load_spec_for_dir(parent_path)
-
-                    # 2. Проверка игнорирования
-                    if self.checker.should_ignore(abs_path, is_dir=is_dir):
-                        continue
-
-                    # 3. Если создана новая папка — добавляем её в мониторинг
-                    if is_dir and (event.mask & (flags.CREATE | flags.MOVED_TO)):
-                        self._add_watch_recursive(abs_path)
-                        continue
-
-                    # 4. Маппинг и yield события для файлов
-                    if not is_dir:
-                        event_type = self._map_mask(event.mask)
-                        if event_type:
-                            try:
-                                rel_path = abs_path.relative_to(self.workspace_path)
-                                yield PipelineFileContext(
-                                    file_path=rel_path,
-                                    abs_path=abs_path,
-                                    event_type=event_type,
-                                    status="pending"
-                                )
-                            except ValueError:
-                                continue
+                    context = self._handle_event(event)
                 except Exception as e:
                     self.log.error("inotify.event.process.failed", error=str(e), event=event)
                     continue
+                if context is not None:
+                    yield context
+        finally:
+            loop.remove_reader(fd)
 
     async def generate(self) -> AsyncGenerator[PipelineFileContext, None]:
-        self.log.info(f"[{self.name}] Starting recursive inotify on: {self.workspace_path}")
+        self.log.info("[%s] Starting recursive inotify on: %s", self.name, self.workspace_path)
         
         # Первоначальный скан существующих файлов перед началом мониторинга
-        self.log.info(f"[{self.name}] Performing initial scan of workspace: {self.workspace_path}")
-        for root, _, files in os.walk(self.workspace_path):
-            root_path = Path(root)
+        self.log.info("[%s] Performing initial scan of workspace: %s", self.name, self.workspace_path)
+        for root, dirs, files in os.walk(self.workspace_path):
+            # Отсекаем игнорируемые поддеревья (node_modules, .git и т.п.) до обхода их файлов
+            dirs[:] = [d for d in dirs if not self.checker.should_ignore(os.path.join(root, d), is_dir=True)]
             for file_name in files:
-                abs_path = root_path / file_name
-                try:
-                    rel_path = abs_path.relative_to(self.workspace_path)
-                    # Пропускаем игнорируемые файлы
-                    if self.checker.should_ignore(abs_path, is_dir=False):
-                        continue
-                    # Отправляем событие создания файла
-                    yield PipelineFileContext(
-                        file_path=rel_path,
-                        abs_path=abs_path,
-                        event_type="create",
-                        status="pending"
-                    )
-                except ValueError:
+                abs_str = os.path.join(root, file_name)
+                # Пропускаем игнорируемые файлы
+                if self.checker.should_ignore(abs_str, is_dir=False):
                     continue
+                rel_path = self._relative_path(abs_str)
+                if rel_path is None:
+                    continue
+                abs_path = Path(abs_str)
+                # Отправляем событие создания файла
+                yield PipelineFileContext(
+                    file_path=rel_path,
+                    abs_path=abs_path,
+                    event_type="create",
+                    status="pending"
+                )
         
         # Запускаем мониторинг inotify
         try:
@@ -136,15 +205,25 @@ class InotifySourceStage(SourceStage):
                 yield event
         finally:
             # Очистка дескрипторов при остановке
-            for wd in list(self._wd_to_path.keys()):
+            for wd in list(self._wd_to_dir.keys()):
                 try:
                     self.inotify.rm_watch(wd)
                 except Exception as e:
                     self.log.warning("inotify.rm_watch.failed", wd=wd, error=str(e))
-            self._wd_to_path.clear()
+            self._wd_to_dir.clear()
+
+    def _relative_path(self, abs_path: str) -> Optional[Path]:
+        """Путь относительно workspace срезом строки вместо Path.relative_to"""
+        if not abs_path.startswith(self._workspace_prefix):
+            return None
+        return Path(abs_path[len(self._workspace_prefix):])
 
     def _map_mask(self, mask: int) -> Optional[EventTypes]:
-        for flag, name in self.FLAG_MAP.items():
-            if mask & flag:
+        # Быстрый выход для масок без интересующих нас битов (ACCESS, ATTRIB и т.п.)
+        if not mask & self._EVENT_MASK:
+            return None
+        # Три проверки по группам вместо обхода всех флагов; у события inotify один бит типа
+        for group_mask, name in self._MASK_GROUPS:
+            if mask & group_mask:
                 return name
         return None
\ No newline at end of file
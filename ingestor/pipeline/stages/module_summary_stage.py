@@ -54,7 +54,7 @@ class ModuleSummaryStage(ProcessorStage):
             # Determine module path using discovery algorithm
             module_path = self._discover_module(file_path)
             if not module_path:
-                self.log.debug(f"No module found for file: {file_path}")
+                self.log.debug("No module found for file: %s", file_path)
                 return context
 
             # Get file summaries for this module
@@ -84,7 +84,7 @@ class ModuleSummaryStage(ProcessorStage):
             )
 
             await self.storage.save_module_summary(module_summary)
-            self.log.info(f"ModuleSummary updated: {module_path} (files={len(module_file_summaries)})")
+            self.log.info("ModuleSummary updated: %s (files=%d)", module_path, len(module_file_summaries))
 
         except Exception as e:
             self.log.error(f"Error in ModuleSummaryStage for {file_path}: {e}", exc_info=True)
@@ -116,13 +116,12 @@ class ModuleSummaryStage(ProcessorStage):
         
         Only returns summaries for files marked as valid and with actual content.
         """
-        all_summaries = await self.storage.get_all_file_summaries()
+        # Хранилище само отбирает файлы модуля — без выгрузки всех саммари на каждый файл
+        summaries = await self.storage.get_file_summaries_by_prefix(module_path + "/")
         
-        # Filter by module path and valid files
         module_file_summaries = [
             {"file_path": fs.file_path, "summary": fs.summary}
-            for fs in all_summaries
-            if fs.file_path.startswith(module_path + "/") and fs.summary
+            for fs in summaries
         ]
         
         return module_file_summaries
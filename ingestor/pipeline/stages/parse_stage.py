@@ -28,15 +28,13 @@ class ParseProcessorStage(ProcessorStage):
             
             if error:
                 self.log.error(f"Failed to parse file {context.file_path}: {error}")
-                context.has_errors = True
-                context.errors.append(f"parse error: {error}")
+                context.add_error(f"parse error: {error}")
                 context.nodes = []
                 return context
             
             if not nodes:
                 self.log.warning(f"No nodes generated for {context.file_path} (binary or empty)")
-                context.has_errors = True
-                context.errors.append("no nodes generated (binary or empty)")
+                context.add_error("no nodes generated (binary or empty)")
                 context.nodes = []
                 return context
             
@@ -47,8 +45,7 @@ class ParseProcessorStage(ProcessorStage):
                 self.log.warning(f"Some nodes had empty text for {context.file_path}")
             
             if not valid_nodes:
-                context.has_errors = True
-                context.errors.append("all nodes empty")
+                context.add_error("all nodes empty")
                 context.nodes = []
                 return context
             
@@ -58,7 +55,6 @@ class ParseProcessorStage(ProcessorStage):
             
         except Exception as e:
             self.log.error(f"Critical parse error for {context.file_path}: {e}", exc_info=True)
-            context.has_errors = True
-            context.errors.append(f"parse error: {str(e)}")
+            context.add_error(f"parse error: {str(e)}")
             context.nodes = []
             return context
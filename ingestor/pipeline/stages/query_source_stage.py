@@ -7,7 +7,6 @@ Query Source Stage
 
 import asyncio
 from typing import Dict, Any, Optional
-from datetime import datetime
 
 from ingestor.pipeline.models.pipeline_search_context import PipelineSearchContext
 from ingestor.pipeline.base.source_stage import SourceStage
@@ -39,7 +38,6 @@ class QuerySourceStage(SourceStage):
             },
             status="pending"
         )
-        context.created_at = datetime.now().timestamp()
 
         await self._queue.put(context)
 
@@ -1,6 +1,7 @@
+import asyncio
 import os
 from pathlib import Path
-from typing import AsyncGenerator
+from typing import AsyncGenerator, List, Tuple
 
 from infra.logger import get_logger
 from ingestor.pipeline.models.pipeline_file_context import PipelineFileContext
@@ -9,60 +10,106 @@ from ingestor.pipeline.base.source_stage import SourceStage
 
 
 class ScannerSourceStage(SourceStage):
+    # Сколько файлов набирается за один заход в поток: мелкие папки листятся пачкой
+    SCAN_BATCH_FILES = 512
+
     def __init__(self, workspace_path: Path, max_workers: int = 2):
         super().__init__("scanner")
         self.workspace_path = Path(workspace_path).resolve()
         self.checker = GitignoreChecker(self.workspace_path)
-        self.log = get_logger('ingestor.scanner.ScannerSourceStage')
-        self.log.info(f"[scanner] Initialized, workspace={self.workspace_path}")
+        # workspace привязан один раз, а не передается в каждый вызов
+        self.log = get_logger('ingestor.scanner.ScannerSourceStage').bind(workspace=str(self.workspace_path))
+        self.log.info("[scanner] Initialized")
 
     async def generate(self) -> AsyncGenerator[PipelineFileContext, None]:
         try:
             if not self.workspace_path.exists():
-                self.log.error("Path does not exist: %s", self.workspace_path)
+                self.log.error("Path does not exist")
                 return
 
             self.log.info("Starting scan...")
 
-            for root, dirs, files in os.walk(self.workspace_path):
-                current_root = Path(root)
-
-                # 1. Динамически подгружаем .gitignore, если встретили ее в новой папке
-                if (current_root / '.gitignore').exists():
-                    self.checker.load_spec_for_dir(current_root)
-
-                # 2. Фильтруем директории (модификация dirs In-place отсекает ветки)
-                # Оставляем только те, что не заигнорены
-                dirs[:] = [
-                    d for d in dirs
-                    if not self.checker.should_ignore(current_root / d, is_dir=True)
-                ]
-
-                # 3. Обрабатываем файлы
-                for filename in files:
-                    file_path = current_root / filename
+            # Обход через os.scandir: mtime/size берем из DirEntry и передаем дальше,
+            # чтобы фильтр и enrich не делали повторный stat() на каждый файл.
+            # Листинг папок идет в потоке пачками, а файлы отдаются сразу по мере обхода —
+            # нижние стадии работают параллельно со сканом, цикл событий не блокируется
+            stack = [(str(self.workspace_path), "")]
+            detected = 0
+            while stack:
+                files = await asyncio.to_thread(self._scan_dirs, stack)
+                detected += len(files)
 
-                    if self.checker.should_ignore(file_path, is_dir=False):
-                        continue
-
-                    try:
-                        rel_path = file_path.relative_to(self.workspace_path)
-                    except ValueError:
-                        continue
-
-                    self.log.info(f"[scanner] File detected {rel_path}")
+                for rel_str, abs_str, size, mtime, mtime_ns in files:
+                    rel_path = Path(rel_str)
+                    self.log.debug("[scanner] File detected %s", rel_path)
                     yield PipelineFileContext(
                         file_path=rel_path,
-                        abs_path=file_path,
+                        abs_path=Path(abs_str),
                         event_type="scan",
+                        size=size,
+                        mtime=mtime,
+                        mtime_ns=mtime_ns,
                         status="pending"
                     )
 
-            self.log.info("Scan completed")
+            # Итог одной строкой вместо info-лога на каждый файл
+            self.log.info("Scan completed: %d files", detected)
         except Exception as e:
             self.log.error("Scan generation error: %s", e, exc_info=True)
             raise
 
+    def _scan_dirs(self, stack: List[Tuple[str, str]]) -> List[tuple]:
+        """Листинг папок со стека (блокирующий), пока не наберется SCAN_BATCH_FILES файлов."""
+        files: List[tuple] = []
+        while stack and len(files) < self.SCAN_BATCH_FILES:
+            root, rel_prefix = stack.pop()
+            dir_files, subdirs = self._scan_dir(root, rel_prefix)
+            files.extend(dir_files)
+            # Порядок обхода как у os.walk: подпапки в порядке листинга
+            stack.extend(reversed(subdirs))
+        return files
+
+    def _scan_dir(self, root: str, rel_prefix: str) -> Tuple[List[tuple], List[tuple]]:
+        """Листинг одной папки (блокирующий): файлы (rel, abs, size, mtime, mtime_ns) и неигнорируемые подпапки."""
+        files: List[tuple] = []
+        subdirs: List[tuple] = []
+        try:
+            with os.scandir(root) as it:
+                entries = list(it)
+        except OSError as e:
+            self.log.warning("scanner.scandir.failed", path=root, error=str(e))
+            return files, subdirs
+
+        # 1. Динамически подгружаем .gitignore, если встретили ее в новой папке
+        if any(e.name == '.gitignore' for e in entries):
+            self.checker.load_spec_for_dir(Path(root))
+
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+
+            # 2. Фильтруем директории, отсекая заигноренные ветки
+            if is_dir:
+                if entry.is_symlink():
+                    continue
+                if not self.checker.should_ignore(entry.path, is_dir=True):
+                    subdirs.append((entry.path, rel_prefix + entry.name + os.sep))
+                continue
+
+            # 3. Обрабатываем файлы: проверки на строках, Path только для прошедших фильтр
+            if self.checker.should_ignore(entry.path, is_dir=False):
+                continue
+
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            files.append((rel_prefix + entry.name, entry.path, st.st_size, st.st_mtime, st.st_mtime_ns))
+
+        return files, subdirs
+
     async def start(self, output_queue) -> None:
         self.log.info("[scanner] start() called")
         await super().start(output_queue)
@@ -1,4 +1,7 @@
-from typing import List, Dict, Any
+import asyncio
+import heapq
+from operator import itemgetter
+from typing import List, Dict, Any, Tuple
 from ingestor.core.models.chunk import Chunk
 from ingestor.pipeline.base.processor_stage import ProcessorStage
 from ingestor.pipeline.models.pipeline_search_context import PipelineSearchContext
@@ -7,6 +10,9 @@ class SearchDBStage(ProcessorStage):
     """
     Выполняет векторный поиск в БД на основе эмбеддингов чанков запроса.
     """
+    # Сколько запросов к БД по частям одного запроса держим в полете
+    MAX_CONCURRENT_SEARCHES = 8
+
     def __init__(self, storage, max_workers: int = 2):
         super().__init__("search_db", max_workers)
         self.storage = storage
@@ -19,8 +25,24 @@ class SearchDBStage(ProcessorStage):
         if not context.is_processable() or not context.chunks:
             return context
 
-        all_results = []
+        # Лучший результат на чанк БД за один проход; ранжирование — только top-k через heap.
+        # Храним (score, чанк, часть запроса), словари ответа собираются только для top-k
+        best: Dict[str, Tuple[float, Chunk, str]] = {}
+        limit = 0
+        sem = asyncio.Semaphore(self.MAX_CONCURRENT_SEARCHES)
+
+        async def search_one(chunk: Chunk, top_k: int, filter_by_file) -> List[Chunk]:
+            async with sem:
+                # Нативный поиск в БД
+                return await self.storage.search_vector(
+                    chunk.embedding,
+                    top_k=top_k,
+                    filter_by_file=filter_by_file
+                )
+
         try:
+            searched: List[Chunk] = []
+            tasks = []
             for chunk in context.chunks:
                 if chunk.embedding is None:
                     continue
@@ -28,29 +50,36 @@ class SearchDBStage(ProcessorStage):
                 # Извлекаем параметры поиска из метаданных (проброшены из QueryParseStage)
                 query_data = chunk.metadata.get('original_query_data', {})
                 top_k = query_data.get('top_k', 5)
-                filter_by_file = query_data.get('filter_by_file')
+                limit = max(limit, top_k)
+                searched.append(chunk)
+                tasks.append(search_one(chunk, top_k, query_data.get('filter_by_file')))
 
-                # Нативный поиск в БД
-                db_results = await self.storage.search_vector(
-                    chunk.embedding,
-                    top_k=top_k,
-                    filter_by_file=filter_by_file
-                )
+            # Запросы по частям независимы — выполняем параллельно, а не по очереди
+            all_results = await asyncio.gather(*tasks)
 
+            for chunk, db_results in zip(searched, all_results):
                 for res in db_results:
-                    all_results.append({
-                        "chunk_id": res.id,
-                        "file_path": res.file_path,
-                        "content": res.content,
-                        "summary": res.summary,
-                        "purpose": res.purpose,
-                        "similarity": 0, # В будущем можно прокинуть score
-                        "metadata": res.metadata,
-                        "chunk_type": res.chunk_type,
-                        "query_chunk": chunk.content
-                    })
+                    score = res.score if res.score is not None else 0.0
+                    # Один чанк БД могли найти несколько частей запроса — оставляем лучший скор
+                    prev = best.get(res.id)
+                    if prev is not None and prev[0] >= score:
+                        continue
+                    best[res.id] = (score, res, chunk.content)
             
-            context.result = all_results
+            context.result = [
+                {
+                    "chunk_id": res.id,
+                    "file_path": res.file_path,
+                    "content": res.content,
+                    "summary": res.summary,
+                    "purpose": res.purpose,
+                    "similarity": score,
+                    "metadata": res.metadata,
+                    "chunk_type": res.chunk_type,
+                    "query_chunk": query_chunk
+                }
+                for score, res, query_chunk in heapq.nlargest(limit, best.values(), key=itemgetter(0))
+            ]
             context.mark_success()
             return context
         except Exception as e:
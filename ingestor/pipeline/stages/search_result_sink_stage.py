@@ -26,7 +26,7 @@ class SearchResultSinkStage(SinkStage):
         self._results = []
 
     # Принимаем PipelineSearchContext вместо List[Dict]
-    async def process(self, context: PipelineSearchContext) -> None:
+    async def consume(self, context: PipelineSearchContext) -> None:
         # Извлекаем результаты из контекста
         if context.result:
             self._results.extend(context.result)
@@ -35,9 +35,5 @@ class SearchResultSinkStage(SinkStage):
         if self._future and not self._future.done():
             self._future.set_result(self._results)
 
-    async def consume(self, context):
-        """Реализация абстрактного метода consume"""
-        await self.process(context)
-
     async def get_results(self) -> List[Dict[str, Any]]:
         return self._results
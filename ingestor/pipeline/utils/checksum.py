@@ -0,0 +1,183 @@
+"""
+Контрольные суммы файлов для детекта изменений.
+
+Для детекта изменений криптостойкость не нужна: по умолчанию xxh3_128,
+затем BLAKE3 и MD5, если соответствующие пакеты не установлены.
+Сумма хранится с префиксом алгоритма ("xxh3:<hex>"), чтобы сравнивать суммы одного алгоритма.
+"""
+
+import asyncio
+import hashlib
+import mmap
+import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    import xxhash
+except ImportError:  # xxhash опционален
+    xxhash = None
+
+try:
+    import blake3
+except ImportError:  # blake3 опционален
+    blake3 = None
+
+from infra.logger import get_logger
+from ingestor.pipeline.utils.executor import get_shared_executor
+
+log = get_logger("ingestor.checksum")
+
+HASH_READ_SIZE = 1 << 20  # 1 MiB
+# Файлы крупнее порога хэшируются через mmap без копирования в Python (BLAKE3 — update_mmap);
+# мелкие читаются одним read(): mmap/munmap и page faults для них дороже копии
+MMAP_THRESHOLD = 1 << 20
+# Файлы до этого размера отображаются целиком и хэшируются одним update()
+MMAP_MAX_SIZE = 256 << 20
+
+CHECKSUM_ALGOS = ("xxh3", "blake3", "md5")
+
+# posix_fadvise есть только на Linux/Unix
+_HAS_FADVISE = hasattr(os, "posix_fadvise")
+_HAS_MADVISE = hasattr(mmap, "MADV_SEQUENTIAL")
+
+# hashlib и blake3 отпускают GIL, поэтому файлы хэшируются параллельно в общем пуле пайплайна.
+# Потоки, ждущие read(), держат несколько запросов к диску в полете — аналог iodepth.
+# Отдельный пул создается, только если глубина задана явно (configure_hash_io_depth).
+_HASH_EXECUTOR: ThreadPoolExecutor | None = None
+_HASH_IO_DEPTH: int | None = None
+
+
+def resolve_checksum_algo(algo: str) -> str:
+    """Возвращает доступный алгоритм: без установленного пакета xxh3 -> blake3 -> md5."""
+    if algo not in CHECKSUM_ALGOS:
+        raise ValueError(f"Unknown checksum algorithm: {algo}")
+    if algo == "xxh3" and xxhash is None:
+        log.warning("checksum.xxh3.unavailable", fallback="blake3")
+        algo = "blake3"
+    if algo == "blake3" and blake3 is None:
+        log.warning("checksum.blake3.unavailable", fallback="md5")
+        algo = "md5"
+    return algo
+
+
+def split_checksum(value: str, default_algo: str = "md5") -> tuple[str, str]:
+    """Разбирает "algo:hex"; суммы без префикса (старые записи) считаются default_algo."""
+    algo, sep, digest = value.partition(":")
+    if sep and algo in CHECKSUM_ALGOS:
+        return algo, digest
+    return default_algo, value
+
+
+def file_checksum(path: Path, algo: str = "md5", size: int | None = None) -> str:
+    """
+    Считает контрольную сумму файла (блокирующий вызов, запускать в executor).
+
+    Args:
+        path: Путь к файлу.
+        algo: Алгоритм из CHECKSUM_ALGOS (уже разрешенный через resolve_checksum_algo).
+        size: Размер файла, если уже известен из stat().
+
+    Returns:
+        Контрольная сумма в виде "algo:hex".
+    """
+    return f"{algo}:{_hexdigest(path, algo, size)}"
+
+
+def _hexdigest(path: Path, algo: str, size: int | None) -> str:
+    if algo == "xxh3":
+        hasher = xxhash.xxh3_128()
+    elif algo == "blake3":
+        hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+        if size is not None and size > MMAP_THRESHOLD:
+            hasher.update_mmap(str(path))
+            return hasher.hexdigest()
+    else:
+        hasher = hashlib.md5()
+
+    # Небуферизованное чтение крупными блоками: меньше syscalls и без двойного копирования
+    with open(path, "rb", buffering=0) as f:
+        if size is not None and size <= MMAP_THRESHOLD:
+            # Типичный исходник — один read() на весь файл, без mmap и fadvise
+            hasher.update(f.read(MMAP_THRESHOLD + 1))
+            # Файл мог вырасти после stat() — дочитываем остаток
+            while chunk := f.read(HASH_READ_SIZE):
+                hasher.update(chunk)
+            return hasher.hexdigest()
+        if size and size <= MMAP_MAX_SIZE:
+            # Один вызов update по всему mmap вместо Python-цикла по блокам
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if _HAS_MADVISE:
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    hasher.update(mm)
+                return hasher.hexdigest()
+            except ValueError:
+                # Файл опустел после stat() — пустой mmap невозможен, читаем обычным способом
+                pass
+        if _HAS_FADVISE:
+            # Подсказываем ядру последовательное чтение для агрессивного read-ahead
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        while chunk := f.read(HASH_READ_SIZE):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def configure_hash_io_depth(io_depth: int) -> None:
+    """Задает число одновременных чтений при хэшировании (до первого использования пула)."""
+    global _HASH_IO_DEPTH
+    if _HASH_EXECUTOR is not None:
+        log.warning("checksum.io_depth.ignored", reason="executor already started", io_depth=io_depth)
+        return
+    _HASH_IO_DEPTH = max(1, io_depth)
+
+
+def _get_hash_executor() -> ThreadPoolExecutor:
+    global _HASH_EXECUTOR
+    if _HASH_IO_DEPTH is None:
+        return get_shared_executor()
+    if _HASH_EXECUTOR is None:
+        _HASH_EXECUTOR = ThreadPoolExecutor(
+            max_workers=_HASH_IO_DEPTH,
+            thread_name_prefix="checksum",
+        )
+    return _HASH_EXECUTOR
+
+
+async def file_checksum_async(path: Path, algo: str = "md5", size: int | None = None) -> str:
+    """Асинхронная обертка над file_checksum, выполняется в общем пуле или пуле хэширования."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_hash_executor(), file_checksum, path, algo, size)
+
+
+def _stat_or_none(path: Path) -> os.stat_result | None:
+    try:
+        return path.stat()
+    except OSError:
+        return None
+
+
+def _stat_and_checksum(
+    path: Path, algo: str, known_checksum: Callable[[os.stat_result], str | None]
+) -> tuple[os.stat_result | None, str | None]:
+    stat = _stat_or_none(path)
+    if stat is None:
+        return None, None
+    checksum = known_checksum(stat)
+    if checksum is None:
+        checksum = file_checksum(path, algo, stat.st_size)
+    return stat, checksum
+
+
+async def stat_and_checksum_async(
+    path: Path, algo: str, known_checksum: Callable[[os.stat_result], str | None]
+) -> tuple[os.stat_result | None, str | None]:
+    """
+    stat() и сумма файла за один заход в пул хэширования.
+
+    known_checksum(stat) выполняется в том же потоке и может вернуть уже известную сумму —
+    тогда файл не читается. (None, None) — файла нет.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_hash_executor(), _stat_and_checksum, path, algo, known_checksum)
@@ -0,0 +1,37 @@
+"""
+Общий пул потоков для блокирующих операций пайплайна.
+
+stat(), обход директорий и хэширование файлов идут в один пул вместо
+отдельного пула на каждую подсистему. Работа в пуле в основном ждет диск,
+поэтому размер — как у стандартного пула asyncio, min(32, CPU + 4), но CPU
+считаются доступные процессу (с учетом cpuset контейнера), а не все CPU машины.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+_SHARED_EXECUTOR: ThreadPoolExecutor | None = None
+
+
+def available_cpus() -> int:
+    """Число CPU, на которых процессу разрешено выполняться."""
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except AttributeError:  # sched_getaffinity есть не на всех платформах
+        return os.cpu_count() or 1
+
+
+def shared_executor_size() -> int:
+    """Число потоков общего пула: запас сверх CPU на потоки, ждущие ввода-вывода."""
+    return min(32, available_cpus() + 4)
+
+
+def get_shared_executor() -> ThreadPoolExecutor:
+    """Пул создается при первом обращении и живет до конца процесса."""
+    global _SHARED_EXECUTOR
+    if _SHARED_EXECUTOR is None:
+        _SHARED_EXECUTOR = ThreadPoolExecutor(
+            max_workers=shared_executor_size(),
+            thread_name_prefix="ingestor",
+        )
+    return _SHARED_EXECUTOR
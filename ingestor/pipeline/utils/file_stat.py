@@ -0,0 +1,30 @@
+"""
+stat() пачки файлов одним заходом в пул потоков.
+"""
+
+import asyncio
+import os
+from pathlib import Path
+
+StatResult = os.stat_result | Exception
+
+
+def _stat_many(paths: list[Path]) -> dict[Path, StatResult]:
+    result: dict[Path, StatResult] = {}
+    for path in paths:
+        try:
+            # stat() сразу проверяет существование файла, отдельный exists() не нужен
+            result[path] = path.stat()
+        except Exception as e:
+            result[path] = e
+    return result
+
+
+async def stat_many(paths: list[Path]) -> dict[Path, StatResult]:
+    """
+    stat() всех путей в одном потоке вместо отдельного to_thread на каждый файл.
+    Ошибка по файлу сохраняется вместо результата и не прерывает пачку.
+    """
+    if not paths:
+        return {}
+    return await asyncio.to_thread(_stat_many, paths)
@@ -1,52 +1,129 @@
+import functools
+import hashlib
+import os
+import stat
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Tuple, Union
 
 import pathspec
 
+# Разобранные .gitignore, общие для всех экземпляров: {путь_к_файлу: ((mtime_ns, size), PathSpec)}.
+# Перезапуск сканера или inotify не перечитывает неизмененные файлы.
+_SPEC_CACHE: Dict[str, Tuple[Tuple[int, int], pathspec.PathSpec]] = {}
+# Скомпилированные спецификации по sha256 содержимого: одинаковые .gitignore
+# в разных папках (типично для монорепозиториев) компилируются один раз
+_COMPILED_SPECS: Dict[bytes, pathspec.PathSpec] = {}
+
+_GIT_SEGMENT = os.sep + '.git' + os.sep
+
+IGNORE_CACHE_SIZE = 65536
+DIR_SPECS_CACHE_SIZE = 4096
+
 
 class GitignoreChecker:
     """Проверяет пути по правилам .gitignore с поддержкой вложенности."""
 
     def __init__(self, workspace_path: Path):
         self.workspace_path = Path(workspace_path).resolve()
-        # Словарь: {путь_к_директории: PathSpec}
-        self.specs: Dict[Path, pathspec.PathSpec] = {}
+        self._workspace_prefix = os.path.join(str(self.workspace_path), '')
+        # Словарь: {путь_к_директории_с_разделителем: PathSpec}; проверка идет по предкам пути,
+        # поэтому стоимость зависит от глубины пути, а не от числа .gitignore в дереве
+        self.specs: Dict[str, pathspec.PathSpec] = {}
+        # Решения по путям (повторные события inotify по тем же файлам и папкам);
+        # сбрасывается при любом изменении набора правил
+        self._cached_should_ignore = functools.lru_cache(maxsize=IGNORE_CACHE_SIZE)(self._should_ignore)
+        # Цепочка применимых спецификаций по родительской папке: файлы одной папки
+        # (полный скан) не повторяют обход предков
+        self._cached_dir_specs = functools.lru_cache(maxsize=DIR_SPECS_CACHE_SIZE)(self._dir_specs)
+
+    def _set_spec(self, dir_key: str, spec: pathspec.PathSpec) -> None:
+        if self.specs.get(dir_key) is not spec:
+            self.specs[dir_key] = spec
+            self._specs_changed()
+
+    def _specs_changed(self) -> None:
+        self._cached_should_ignore.cache_clear()
+        self._cached_dir_specs.cache_clear()
 
     def load_spec_for_dir(self, dir_path: Path) -> None:
         """Загружает .gitignore конкретной директории, если он существует."""
         gitignore_file = dir_path / '.gitignore'
-        if gitignore_file.is_file():
-            try:
-                with open(gitignore_file, 'r', encoding='utf-8') as f:
-                    spec = pathspec.PathSpec.from_lines(
-                        pathspec.patterns.GitWildMatchPattern,
-                        f
-                    )
-                    self.specs[dir_path] = spec
-            except Exception:
-                pass
-
-    def should_ignore(self, path: Path, is_dir: bool = False) -> bool:
+        dir_key = os.path.join(str(dir_path), '')
+        try:
+            st = gitignore_file.stat()
+        except OSError:
+            st = None
+        if st is None or not stat.S_ISREG(st.st_mode):
+            # .gitignore удален — правила этой папки больше не действуют
+            _SPEC_CACHE.pop(str(gitignore_file), None)
+            if self.specs.pop(dir_key, None) is not None:
+                self._specs_changed()
+            return
+
+        key = str(gitignore_file)
+        version = (st.st_mtime_ns, st.st_size)
+        cached = _SPEC_CACHE.get(key)
+        if cached is not None and cached[0] == version:
+            self._set_spec(dir_key, cached[1])
+            return
+
+        try:
+            with open(gitignore_file, 'rb') as f:
+                content = f.read()
+            digest = hashlib.sha256(content).digest()
+            spec = _COMPILED_SPECS.get(digest)
+            if spec is None:
+                # GitIgnoreSpec повторяет семантику git (отрицания, приоритет правил)
+                spec = pathspec.GitIgnoreSpec.from_lines(content.decode('utf-8').splitlines())
+                _COMPILED_SPECS[digest] = spec
+        except Exception:
+            return
+        _SPEC_CACHE[key] = (version, spec)
+        self._set_spec(dir_key, spec)
+
+    def should_ignore(self, path: Union[str, Path], is_dir: bool = False) -> bool:
         """
         Проверяет, должен ли быть проигнорирован путь.
         Учитывает все применимые спецификации от корня до текущей папки.
+        Принимает str, чтобы сканеры не создавали Path на каждую запись.
         """
-        abs_path = path if path.is_absolute() else self.workspace_path / path
+        return self._cached_should_ignore(str(path), is_dir)
+
+    def _should_ignore(self, abs_path: str, is_dir: bool) -> bool:
+        if not os.path.isabs(abs_path):
+            abs_path = self._workspace_prefix + abs_path
 
         # Базовая проверка системных папок git
-        if '.git' in abs_path.parts:
+        if _GIT_SEGMENT in abs_path + os.sep:
             return True
 
-        # Проверяем путь всеми загруженными спецификациями,
-        # которые являются родительскими для данного пути
-        for gi_dir, spec in self.specs.items():
-            if abs_path.is_relative_to(gi_dir):
-                # Для корректного матчинга директорий в gitignore
-                # путь должен заканчиваться на слэш
-                rel_path = str(abs_path.relative_to(gi_dir))
-                if is_dir and not rel_path.endswith('/'):
-                    rel_path += '/'
-
-                if spec.match_file(rel_path):
-                    return True
+        if not self.specs or not abs_path.startswith(self._workspace_prefix):
+            return False
+
+        parent_key = abs_path[:abs_path.rfind(os.sep) + 1]
+        for key_len, spec in self._cached_dir_specs(parent_key):
+            rel_path = abs_path[key_len:]
+            # Для корректного матчинга директорий в gitignore
+            # путь должен заканчиваться на слэш
+            if is_dir and not rel_path.endswith('/'):
+                rel_path += '/'
+
+            if spec.match_file(rel_path):
+                return True
         return False
+
+    def _dir_specs(self, dir_key: str) -> Tuple[Tuple[int, pathspec.PathSpec], ...]:
+        """
+        Спецификации папки и ее предков от ближайшей к корню workspace
+        в виде (длина префикса папки, PathSpec); dir_key заканчивается разделителем.
+        """
+        chain = []
+        # Идем по папкам-предкам и берем их спецификации поиском в словаре
+        root_sep = len(self._workspace_prefix) - 1
+        sep = len(dir_key) - 1
+        while sep >= root_sep:
+            spec = self.specs.get(dir_key[:sep + 1])
+            if spec is not None:
+                chain.append((sep + 1, spec))
+            sep = dir_key.rfind(os.sep, 0, sep)
+        return tuple(chain)
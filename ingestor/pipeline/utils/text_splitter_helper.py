@@ -5,12 +5,24 @@ Provides common functionality for chunking both files and queries,
 making it reusable across different pipelines.
 """
 
+import re
+
 import aiofiles
+from functools import lru_cache
 from typing import List, Tuple, Optional, Dict
 
 from llama_index.core.node_parser import CodeSplitter, MarkdownNodeParser, SentenceSplitter
 from llama_index.core.schema import Document, TextNode
 
+# Расширения конфигов, которые режутся SentenceSplitter с config_chunk_* параметрами
+CONFIG_EXTENSIONS = frozenset((".yaml", ".yml", ".toml"))
+
+# Сколько разных запросов помнит кэш разбиения на предложения
+QUERY_SPLIT_CACHE_SIZE = 4096
+
+# Границы предложений в запросе: один проход регулярным выражением вместо replace + split
+_SENTENCE_END = re.compile(r"[.!?]")
+
 
 class TextSplitterHelper:
     """
@@ -49,7 +61,7 @@ class TextSplitterHelper:
             )
         elif extension == ".md":
             return "doc", MarkdownNodeParser()
-        elif extension in {".yaml", ".yml", ".toml"}:
+        elif extension in CONFIG_EXTENSIONS:
             return "config", SentenceSplitter(
                 chunk_size=self.config_chunk_size,
                 chunk_overlap=self.config_chunk_overlap,
@@ -147,7 +159,7 @@ class TextSplitterHelper:
         Returns:
             Tuple of (chunks, error). chunks is List[Dict] with keys: content, metadata, chunk_type.
         """
-        if not text or not text.strip():
+        if not text or text.isspace():
             return [], "Empty text provided"
 
         try:
@@ -160,18 +172,17 @@ class TextSplitterHelper:
         except Exception as e:
             return [], f"Failed to split text: {e}"
 
-        # Convert TextNode to simple dict format
-        chunks = []
-        for idx, node in enumerate(nodes):
-            chunk_meta = dict(node.metadata or {})
-            chunk_meta["chunk_index"] = idx
-            chunk_meta["chunk_type"] = chunk_type
-            
-            chunks.append({
+        # Convert TextNode to simple dict format.
+        # У каждого чанка свой chunk_index, поэтому копия метаданных нужна,
+        # но собираем ее одним литералом, без промежуточного пустого dict
+        chunks = [
+            {
                 "content": node.text,
-                "metadata": chunk_meta,
+                "metadata": {**node.metadata, "chunk_index": idx, "chunk_type": chunk_type},
                 "chunk_type": chunk_type,
-            })
+            }
+            for idx, node in enumerate(nodes)
+        ]
 
         return chunks, None
 
@@ -188,35 +199,49 @@ class TextSplitterHelper:
         Returns:
             Tuple of (chunks, error). chunks is List[str].
         """
-        if not text or not text.strip():
+        if not text or text.isspace():
             return [], "Empty text provided"
 
-        # Simple sentence splitting
-        sentences = []
-        current_chunk = ""
-        
-        # Split by sentence boundaries
-        for sentence in text.replace('!', '.').replace('?', '.').split('.'):
-            sentence = sentence.strip()
-            if not sentence:
-                continue
-                
-            # If adding this sentence would exceed limit, save current chunk
-            if current_chunk and len(current_chunk) + len(sentence) + 1 > max_chars:
-                sentences.append(current_chunk.strip())
-                current_chunk = sentence + "."
-            else:
-                if current_chunk:
-                    current_chunk += " " + sentence + "."
-                else:
-                    current_chunk = sentence + "."
-        
-        # Add final chunk
-        if current_chunk:
-            sentences.append(current_chunk.strip())
+        # Повторные запросы берутся из кэша; наружу — новый список, кэш неизменяем
+        return list(_split_query_cached(text, max_chars)), None
+
+
+@lru_cache(maxsize=QUERY_SPLIT_CACHE_SIZE)
+def _split_query_cached(text: str, max_chars: int) -> Tuple[str, ...]:
+    """Разбиение запроса на предложения; кортеж — чтобы результат можно было кэшировать."""
+    # Короткий запрос без границ предложений (типичный случай) — та же нормализация, без split()
+    if len(text) <= max_chars and not _SENTENCE_END.search(text):
+        return (text.strip() + ".",)
+
+    # Simple sentence splitting
+    sentences = []
+    # Части текущего чанка и его длина с пробелами: join один раз при сбросе,
+    # а не конкатенация строки на каждое предложение (квадратично на длинных запросах)
+    parts: List[str] = []
+    current_len = 0
+
+    # Split by sentence boundaries
+    for sentence in _SENTENCE_END.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        part = sentence + "."
+
+        # If adding this sentence would exceed limit, save current chunk
+        if parts and current_len + len(part) > max_chars:
+            sentences.append(" ".join(parts))
+            parts = [part]
+            current_len = len(part)
+        else:
+            current_len += len(part) + 1 if parts else len(part)
+            parts.append(part)
+
+    # Add final chunk
+    if parts:
+        sentences.append(" ".join(parts))
 
-        # If no chunks created (text too long or no sentences), return original text
-        if not sentences:
-            return [text], None
+    # If no chunks created (text too long or no sentences), return original text
+    if not sentences:
+        return (text,)
 
-        return sentences, None
+    return tuple(sentences)
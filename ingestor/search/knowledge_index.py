@@ -62,7 +62,7 @@ class KnowledgeIndex:
         Returns:
             Dictionary with results and metadata
         """
-        log.info("knowledge_index.search", query=query[:100], top_k=top_k, filter_by_file=filter_by_file)
+        log.debug("knowledge_index.search", query_prefix=query[:100], top_k=top_k, filter_by_file=filter_by_file)
         
         try:
             # Create retriever
@@ -103,7 +103,7 @@ class KnowledgeIndex:
                     if len(results) >= top_k:
                         break
             
-            log.info("knowledge_index.search.complete", results_count=len(results))
+            log.debug("knowledge_index.search.complete", results_count=len(results))
             return {"results": results, "total": len(results)}
             
         except Exception as e:
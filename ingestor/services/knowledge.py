@@ -53,26 +53,24 @@ class KnowledgePort:
         
         NOTE: Это legacy метод. Новый код должен использовать search().
         """
-        log.info("knowledge_port.search.embedding", top_k=top_k)
+        log.debug("knowledge_port.search.embedding", top_k=top_k)
         
         # Прямой вызов storage для обратной совместимости
         chunks = await self.context.storage.search_vector(query_embedding, top_k)
         
         results = []
         for chunk in chunks:
-            # Вычисляем similarity явно для ответа (так как search_vector вернул уже отсортированные)
-            # В идеале DB возвращает similarity, но у нас пока просто чанки
             results.append({
                 "chunk_id": chunk.id,
                 "file_path": chunk.file_path,
                 "content": chunk.content,
                 "summary": chunk.summary,
                 "purpose": chunk.purpose,
-                "similarity": 0.0,  # TODO: DB должен возвращать score
+                "similarity": chunk.score if chunk.score is not None else 0.0,
                 "metadata": chunk.metadata,
             })
         
-        log.info("knowledge_port.search.complete", results_count=len(results))
+        log.debug("knowledge_port.search.complete", results_count=len(results))
         return results
 
     async def search(self, query: str, top_k: int = 5) -> Dict[str, Any]:
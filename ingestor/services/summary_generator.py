@@ -8,6 +8,11 @@ import hashlib
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 
+try:
+    import xxhash
+except ImportError:  # xxhash опционален
+    xxhash = None
+
 from llama_index.core.llms import LLM
 from infra.logger import get_logger
 from ingestor.services.lock import LLMLockManager
@@ -16,6 +21,14 @@ from ingestor.services.lock import LLMLockManager
 logger = get_logger("ingestor.summary")
 
 
+def _cache_key(text: str) -> str:
+    """Ключ кэша саммари: 16 hex-символов, xxh3_64 если доступен, иначе префикс MD5"""
+    data = text.encode()
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(data)
+    return hashlib.md5(data).hexdigest()[:16]
+
+
 # === Prompts ===
 
 FILE_SUMMARY_PROMPT = """Summarize this file in 1-2 sentences, focusing on its purpose and key functionality.
@@ -95,7 +108,7 @@ class SummaryGenerator:
             Generated summary string (1-2 sentences)
         """
         # Create cache key from content hash
-        content_hash = hashlib.md5(content.encode()).hexdigest()[:16]
+        content_hash = _cache_key(content)
         
         if use_cache:
             cached = self._cache.get(content_hash)
@@ -144,7 +157,7 @@ class SummaryGenerator:
         
         # Create cache key from sorted file paths
         paths_sorted = sorted(fs['file_path'] for fs in file_summaries if fs.get('summary'))
-        cache_key = hashlib.md5("|".join(paths_sorted).encode()).hexdigest()[:16]
+        cache_key = _cache_key("|".join(paths_sorted))
         
         if use_cache:
             cached = self._cache.get(cache_key)
@@ -0,0 +1,119 @@
+"""Tests for EmbeddingModel batching against a mocked embedding service."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from ingestor.adapters.embedding_model import EmbeddingModel
+from ingestor.core.models.chunk import Chunk
+
+
+class FakeEmbeddingService:
+    """Async httpx handler: one vector per input text, tracks overlapping requests."""
+
+    def __init__(self, delay: float = 0.05) -> None:
+        self.delay = delay
+        self.requests = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        texts = json.loads(request.content)["input"]
+        self.requests.append(texts)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        return httpx.Response(200, json={"data": [{"embedding": vector_for(t)} for t in texts]})
+
+
+def vector_for(text: str) -> list:
+    return [float(len(text)), float(sum(map(ord, text)))]
+
+
+def make_chunks(count: int) -> list:
+    return [
+        Chunk(id=str(i), file_path="a.py", content=f"chunk {i}", start_line=0, end_line=0, chunk_type="code")
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def service():
+    service = FakeEmbeddingService()
+    EmbeddingModel._shared_client = httpx.AsyncClient(transport=httpx.MockTransport(service))
+    yield service
+    EmbeddingModel._shared_client = None
+
+
+def test_run_overlaps_batches_up_to_request_limit(service):
+    """Test that run() keeps several batches in flight when the limiter allows it."""
+    model = EmbeddingModel(
+        "http://emb", "key", "model",
+        batch_size=2, cache_size=0, coalesce_wait_ms=0, max_concurrent_requests=3,
+    )
+    chunks = make_chunks(12)
+
+    asyncio.run(model.run(chunks))
+
+    assert len(service.requests) == 6
+    assert service.peak_in_flight == 3
+    assert [c.embedding for c in chunks] == [vector_for(c.content) for c in chunks]
+
+
+def test_run_is_serial_with_single_rate_limiter_slot(service):
+    """Test that the default 100 rpm limiter (one slot) sends batches one at a time."""
+    model = EmbeddingModel("http://emb", "key", "model", batch_size=2, cache_size=0, coalesce_wait_ms=0)
+    chunks = make_chunks(6)
+
+    asyncio.run(model.run(chunks))
+
+    assert len(service.requests) == 3
+    assert service.peak_in_flight == 1
+    assert [c.embedding for c in chunks] == [vector_for(c.content) for c in chunks]
+
+
+def test_concurrent_small_requests_are_coalesced_into_one_post(service):
+    """Test that small concurrent get_embeddings() calls share one request and get their own vectors."""
+    model = EmbeddingModel("http://emb", "key", "model", batch_size=10, cache_size=0, coalesce_wait_ms=20)
+    texts = [[f"query {i}"] for i in range(5)]
+
+    async def scenario():
+        return await asyncio.gather(*(model.get_embeddings(t) for t in texts))
+
+    results = asyncio.run(scenario())
+
+    assert service.requests == [[t[0] for t in texts]]
+    assert results == [[vector_for(t[0])] for t in texts]
+
+
+def test_coalescing_flushes_at_batch_size_and_keeps_caller_order(service):
+    """Test that a full batch is sent without waiting and each caller gets its slice in order."""
+    model = EmbeddingModel("http://emb", "key", "model", batch_size=6, cache_size=0, coalesce_wait_ms=1000)
+    texts = [[f"c{i}-t{j}" for j in range(3)] for i in range(4)]
+
+    async def scenario():
+        return await asyncio.wait_for(asyncio.gather(*(model.get_embeddings(t) for t in texts)), timeout=0.5)
+
+    results = asyncio.run(scenario())
+
+    assert service.requests == [texts[0] + texts[1], texts[2] + texts[3]]
+    assert results == [[vector_for(text) for text in t] for t in texts]
+
+
+def test_cached_and_fetched_vectors_are_returned_in_input_order(service):
+    """Test that cache hits and fetched misses are merged back in the order of the input."""
+    model = EmbeddingModel("http://emb", "key", "model", batch_size=10, coalesce_wait_ms=0)
+
+    async def scenario():
+        await model.get_embeddings(["b", "d"])
+        return await model.get_embeddings(["a", "b", "c", "d"])
+
+    result = asyncio.run(scenario())
+
+    assert service.requests == [["b", "d"], ["a", "c"]]
+    assert result == [vector_for(t) for t in ["a", "b", "c", "d"]]
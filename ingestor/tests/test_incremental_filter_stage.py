@@ -0,0 +1,93 @@
+"""Tests for IncrementalFilterStage batching and shutdown ordering."""
+
+import asyncio
+from pathlib import Path
+
+from ingestor.pipeline.base.queues import ThrottledQueue
+from ingestor.pipeline.models.pipeline_file_context import PipelineFileContext
+from ingestor.pipeline.stages.incremental_filter_stage import IncrementalFilterStage
+
+
+class SlowMetadataStorage:
+    """Storage port double: every batch lookup takes `delay`, known files are unchanged."""
+
+    def __init__(self, delay: float = 0.0, known=None) -> None:
+        self.delay = delay
+        self.known = known or {}
+        self.calls = 0
+
+    async def get_files_metadata(self, file_paths):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {path: self.known[path] for path in file_paths if path in self.known}
+
+
+def scanned(name: str, mtime_ns: int = 1_000_000_000) -> PipelineFileContext:
+    return PipelineFileContext(
+        file_path=Path(name),
+        abs_path=Path("/workspace") / name,
+        event_type="scan",
+        size=1,
+        mtime=mtime_ns / 1e9,
+        mtime_ns=mtime_ns,
+    )
+
+
+async def drain(queue: ThrottledQueue) -> list:
+    """Items up to the poison pill."""
+    items = []
+    while (item := await asyncio.wait_for(queue.get(), timeout=5)) is not None:
+        items.append(item)
+    return items
+
+
+def test_poison_pill_follows_batch_waiting_for_check_slot():
+    """Test that None is forwarded only after a batch still waiting in _dispatch is checked."""
+    async def scenario():
+        stage = IncrementalFilterStage(SlowMetadataStorage(delay=0.2), batch_size=5, max_wait=0.01)
+        input_queue, output_queue = ThrottledQueue(100), ThrottledQueue(100)
+        await stage.start(input_queue, output_queue)
+        try:
+            # Two batches occupy both check slots, the third one waits for a slot in the flush loop
+            for b in range(3):
+                await input_queue.put([scanned(f"{b}_{i}.py") for i in range(5)])
+                await asyncio.sleep(0.03)
+            await input_queue.put(None)
+
+            items = await drain(output_queue)
+            await asyncio.sleep(0.3)
+            return items, output_queue.qsize
+        finally:
+            await stage.stop()
+
+    items, late = asyncio.run(scenario())
+
+    assert len(items) == 15
+    assert late == 0
+
+
+def test_unchanged_files_are_filtered_and_inotify_events_pass_immediately():
+    """Test that known unchanged scan files are dropped while other events pass through."""
+    known = {"same.py": {"mtime": 1.0, "size": 1, "mtime_ns": 1_000_000_000}}
+
+    async def scenario():
+        storage = SlowMetadataStorage(known=known)
+        stage = IncrementalFilterStage(storage, batch_size=100, max_wait=0.01)
+        input_queue, output_queue = ThrottledQueue(100), ThrottledQueue(100)
+        await stage.start(input_queue, output_queue)
+        try:
+            modified = PipelineFileContext(file_path=Path("same.py"), abs_path=Path("/workspace/same.py"), event_type="modify")
+            await input_queue.put([scanned("same.py"), scanned("new.py"), scanned("changed.py", 2_000_000_000), modified])
+            await input_queue.put(None)
+            return await drain(output_queue), storage.calls
+        finally:
+            await stage.stop()
+
+    items, calls = asyncio.run(scenario())
+
+    assert [(str(c.file_path), c.event_type) for c in items] == [
+        ("same.py", "modify"),
+        ("new.py", "scan"),
+        ("changed.py", "scan"),
+    ]
+    assert calls == 1
@@ -0,0 +1,61 @@
+"""Tests for ProcessorStage queue draining across workers."""
+
+import asyncio
+
+from ingestor.pipeline.base.processor_stage import ProcessorStage
+from ingestor.pipeline.base.queues import ThrottledQueue
+
+
+class RecordingStage(ProcessorStage):
+    DRAIN_BATCH_SIZE = 64
+
+    def __init__(self, max_workers: int) -> None:
+        super().__init__("recording", max_workers)
+        self.batches = []
+
+    async def process_many(self, items):
+        self.batches.append(list(items))
+        await asyncio.sleep(0.05)
+        return [item * 10 for item in items]
+
+
+def test_backlog_is_split_evenly_between_idle_workers():
+    """Test that a burst arriving at idle workers is shared instead of drained by one worker."""
+    async def scenario():
+        stage = RecordingStage(max_workers=4)
+        input_queue, output_queue = ThrottledQueue(100), ThrottledQueue(100)
+        await stage.start(input_queue, output_queue)
+        try:
+            await asyncio.sleep(0.01)  # all workers wait in get()
+            await input_queue.put_many(range(40))
+            results = [await asyncio.wait_for(output_queue.get(), timeout=1) for _ in range(40)]
+            return stage.batches, results
+        finally:
+            await stage.stop()
+
+    batches, results = asyncio.run(scenario())
+
+    assert len(batches) == 4
+    assert max(len(b) for b in batches) <= 11
+    assert sorted(item for b in batches for item in b) == list(range(40))
+    assert sorted(results) == [i * 10 for i in range(40)]
+
+
+def test_single_worker_drains_up_to_batch_size_and_skips_poison_pill():
+    """Test that one worker takes ready items in DRAIN_BATCH_SIZE chunks, in order, ignoring None."""
+    async def scenario():
+        stage = RecordingStage(max_workers=1)
+        input_queue, output_queue = ThrottledQueue(200), ThrottledQueue(200)
+        await input_queue.put_many([*range(100), None])
+        await stage.start(input_queue, output_queue)
+        try:
+            results = [await asyncio.wait_for(output_queue.get(), timeout=1) for _ in range(100)]
+            await asyncio.wait_for(input_queue.queue.join(), timeout=1)
+            return stage.batches, results
+        finally:
+            await stage.stop()
+
+    batches, results = asyncio.run(scenario())
+
+    assert [len(b) for b in batches] == [64, 36]
+    assert results == [i * 10 for i in range(100)]
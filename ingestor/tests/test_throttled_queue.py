@@ -0,0 +1,86 @@
+"""Tests for ThrottledQueue ordering and backpressure."""
+
+import asyncio
+
+from ingestor.pipeline.base.queues import ThrottledQueue
+
+
+def test_put_get_keep_fifo_order_across_fast_and_slow_paths():
+    """Test that put/put_many/get preserve order below and above the throttle threshold."""
+    async def scenario():
+        queue = ThrottledQueue(maxsize=10, throttle_delay=0)
+        # 0..8 go through the fast path, 9 crosses the 80% threshold and takes the slow one
+        for i in range(4):
+            await queue.put(i)
+        await queue.put_many(range(4, 9))
+        await queue.put(9)
+
+        items = [await queue.get() for _ in range(10)]
+        return queue, items
+
+    queue, items = asyncio.run(scenario())
+
+    assert items == list(range(10))
+    assert queue.metrics["put_count"] == 10
+    assert queue.metrics["get_count"] == 10
+    assert queue.qsize == 0
+
+
+def test_put_blocks_on_full_queue_until_consumer_gets():
+    """Test that put() waits while the queue is full and resumes after get()."""
+    async def scenario():
+        queue = ThrottledQueue(maxsize=2, throttle_delay=0)
+        await queue.put("a")
+        await queue.put("b")
+
+        producer = asyncio.create_task(queue.put("c"))
+        await asyncio.sleep(0.05)
+        blocked = not producer.done()
+
+        first = await queue.get()
+        await asyncio.wait_for(producer, timeout=1)
+        rest = [await queue.get(), await queue.get()]
+        return blocked, [first, *rest]
+
+    blocked, items = asyncio.run(scenario())
+
+    assert blocked
+    assert items == ["a", "b", "c"]
+
+
+def test_put_many_larger_than_capacity_waits_for_consumer_and_keeps_order():
+    """Test that put_many() applies backpressure item by item without reordering."""
+    async def scenario():
+        queue = ThrottledQueue(maxsize=3, throttle_delay=0)
+        producer = asyncio.create_task(queue.put_many(range(10)))
+        await asyncio.sleep(0.05)
+        blocked_at = queue.qsize if not producer.done() else None
+
+        items = []
+        while len(items) < 10:
+            items.append(await asyncio.wait_for(queue.get(), timeout=1))
+        await asyncio.wait_for(producer, timeout=1)
+        return blocked_at, items, queue
+
+    blocked_at, items, queue = asyncio.run(scenario())
+
+    assert blocked_at == 3
+    assert items == list(range(10))
+    assert queue.metrics["put_count"] == 10
+
+
+def test_get_waits_for_item_from_producer():
+    """Test that get() on an empty queue returns the next item once it is put."""
+    async def scenario():
+        queue = ThrottledQueue(maxsize=5, throttle_delay=0)
+        consumer = asyncio.create_task(queue.get())
+        await asyncio.sleep(0.01)
+        waiting = not consumer.done()
+        await queue.put_many(["x", None])
+        return waiting, await asyncio.wait_for(consumer, timeout=1), await queue.get()
+
+    waiting, item, pill = asyncio.run(scenario())
+
+    assert waiting
+    assert item == "x"
+    assert pill is None